@@ -87,6 +87,14 @@ async def main() -> None:
     finally:
         if not bot.is_closed():
             await bot.close()
+        # 明確卸載尚未卸載的 extensions（停止各 Cog 的排程 task），
+        # 之後才關閉共用資料庫並排空剩餘的佇列事件
+        for name in tuple(bot.extensions):
+            try:
+                await bot.unload_extension(name)
+            except Exception:
+                logger.warning("Failed to unload extension %s", name, exc_info=True)
+        await asyncio.to_thread(bot.db.close)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ import logging
 import discord
 from discord.ext import commands
 from humanitz_bot.config import Settings
+from humanitz_bot.services.database import Database
 
 logger = logging.getLogger("humanitz_bot.bot")
 
@@ -35,6 +36,12 @@ async def create_bot(settings: Settings) -> commands.Bot:
     # 將 settings 儲存到 bot 供 Cogs 使用
     bot.settings = settings  # type: ignore[attr-defined]
 
+    # 共用資料庫由 bot 持有（多個 Cog 共用），於 bot 關閉流程中關閉而非隨單一 Cog 卸載
+    bot.db = Database(  # type: ignore[attr-defined]
+        data_dir="data",
+        retention_days=settings.db_retention_days,
+    )
+
     @bot.event
     async def on_ready():
         """Bot 就緒時的回呼"""
@@ -14,7 +14,7 @@ from humanitz_bot.services.player_identity import (
     PlayerIdentityService,
 )
 from humanitz_bot.services.rcon_service import RconService
-from humanitz_bot.utils.i18n import _STRINGS
+from humanitz_bot.utils.i18n import _RESOLVED
 
 logger = logging.getLogger("humanitz_bot.cogs.admin_commands")
 
@@ -84,8 +84,7 @@ _RCON_COMMAND_MAP: dict[str, str] = {
 
 def _t(key: str, locale: str, **kwargs: object) -> str:
     """取得指定語系的翻譯字串。"""
-    table = _STRINGS.get(locale, _STRINGS["en"])
-    text = table.get(key) or _STRINGS["en"].get(key, key)
+    text = _RESOLVED.get(locale, _RESOLVED["en"]).get(key, key)
     if kwargs:
         return text.format(**kwargs)
     return text
@@ -352,7 +351,10 @@ class AdminCommandsCog(commands.Cog):
         identity = self._get_identity_service()
         if identity is None:
             return False
-        steam_id = await asyncio.to_thread(identity.get_steam_id, player_name)
+        # 快取命中時不必切換執行緒，未命中才到執行緒查 SQLite
+        steam_id = identity.get_steam_id_fast(player_name.lower())
+        if steam_id is None:
+            steam_id = await asyncio.to_thread(identity.get_steam_id, player_name)
         if steam_id is None:
             return False
         return self._is_game_admin(steam_id)
@@ -152,7 +152,8 @@ class ChatBridgeCog(commands.Cog):
         db = self._get_db()
         for event in new_events:
             if db and event.event_type != ChatEventType.UNKNOWN:
-                await asyncio.to_thread(self._log_event, db, event)
+                # 只是排入 DB 背景寫入佇列，不會阻塞 event loop
+                self._log_event(db, event)
 
             # 偵測遊戲內指令（! 前綴）
             if (
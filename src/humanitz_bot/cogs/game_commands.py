@@ -14,7 +14,7 @@ from discord.ext import commands
 from humanitz_bot.services.player_identity import PlayerIdentityService
 from humanitz_bot.services.rcon_service import RconService
 from humanitz_bot.services.save_service import SaveService
-from humanitz_bot.utils.i18n import _STRINGS
+from humanitz_bot.utils.i18n import _RESOLVED
 from humanitz_bot.utils import i18n
 
 logger = logging.getLogger("humanitz_bot.cogs.game_commands")
@@ -69,8 +69,7 @@ def _build_kill_detail(player: object, locale: str) -> str:
 
 def _t(key: str, locale: str, **kwargs: object) -> str:
     """取得指定語系的翻譯字串。"""
-    table = _STRINGS.get(locale, _STRINGS["en"])
-    text = table.get(key) or _STRINGS["en"].get(key, key)
+    text = _RESOLVED.get(locale, _RESOLVED["en"]).get(key, key)
     if kwargs:
         return text.format(**kwargs)
     return text
@@ -285,8 +284,10 @@ class GameCommandsCog(commands.Cog):
         if identity is None:
             return self._error_response("cmd.no_save_data", locale)
 
-        # 透過 identity service 取得 steam_id
-        steam_id = await asyncio.to_thread(identity.get_steam_id, player_name)
+        # 透過 identity service 取得 steam_id（快取命中時不必切換執行緒，未命中才查 SQLite）
+        steam_id = identity.get_steam_id_fast(player_name.lower())
+        if steam_id is None:
+            steam_id = await asyncio.to_thread(identity.get_steam_id, player_name)
         if steam_id is None:
             return self._error_response(
                 "cmd.player_not_found", locale, name=player_name
@@ -337,7 +338,10 @@ class GameCommandsCog(commands.Cog):
         if identity is None:
             return self._error_response("cmd.no_save_data", locale)
 
-        steam_id = await asyncio.to_thread(identity.get_steam_id, player_name)
+        # 快取命中時不必切換執行緒，未命中才到執行緒查 SQLite
+        steam_id = identity.get_steam_id_fast(player_name.lower())
+        if steam_id is None:
+            steam_id = await asyncio.to_thread(identity.get_steam_id, player_name)
         if steam_id is None:
             return self._error_response(
                 "cmd.player_not_found", locale, name=player_name
@@ -52,10 +52,7 @@ class ServerStatusCog(commands.Cog):
             settings.rcon_host, settings.rcon_port, settings.rcon_password
         )
         self.player_tracker = PlayerTracker(settings.player_log_path)
-        self.db = Database(
-            data_dir="data",
-            retention_days=settings.db_retention_days,
-        )
+        self.db: Database = bot.db  # type: ignore[attr-defined]
         self.chart_service = ChartService(
             db=self.db,
             tmp_dir="tmp",
@@ -12,6 +12,9 @@ logger = logging.getLogger("humanitz_bot.config")
 
 _PLACEHOLDER_PATTERNS = ("YOUR_", "PLACEHOLDER", "CHANGEME", "TODO", "REPLACE")
 
+# uesave 完整 JSON（約 280MB）預設路徑；放在磁碟上，避免超出容器 /dev/shm 的容量上限
+_DEFAULT_SAVE_JSON_PATH = "/tmp/main_save.json"
+
 
 def _is_placeholder(value: str) -> bool:
     if not value:
@@ -55,7 +58,7 @@ class Settings:
     # 存檔解析設定（選用）
     enable_game_commands: bool = True
     save_file_path: str = ""  # 空 = 自動偵測預設路徑
-    save_json_path: str = "/tmp/main_save.json"
+    save_json_path: str = _DEFAULT_SAVE_JSON_PATH
     save_parse_interval: int = 300  # seconds, 0 = disabled
     save_parse_cooldown: int = 60   # min seconds between on-demand parses
     # 管理員設定（選用）
@@ -158,7 +161,9 @@ class Settings:
             "yes",
         )
         save_file_path = os.getenv("SAVE_FILE_PATH", "").strip()
-        save_json_path = os.getenv("SAVE_JSON_PATH", "/tmp/main_save.json").strip()
+        save_json_path = (
+            os.getenv("SAVE_JSON_PATH", "").strip() or _DEFAULT_SAVE_JSON_PATH
+        )
         save_parse_interval_str = os.getenv("SAVE_PARSE_INTERVAL", "300").strip()
         save_parse_cooldown_str = os.getenv("SAVE_PARSE_COOLDOWN", "60").strip()
         admin_discord_ids_str = os.getenv("ADMIN_DISCORD_IDS", "").strip()
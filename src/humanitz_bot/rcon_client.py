@@ -261,6 +261,24 @@ class SourceRCON:
         )
         return combined, packets
 
+    def execute_many_simple(
+        self, commands: list[str], read_timeout: float = 3.5
+    ) -> list[str]:
+        """在同一個呼叫中依序執行多個指令，回傳各指令的回應文字。
+
+        HumanitZ 回應封包的 request_id 固定為 0，無法以 id 區分同時送出的
+        多個指令回應，因此仍逐一送出並以短超時讀取；好處是呼叫端只需
+        一次 asyncio.to_thread 即可完成整批指令。
+
+        Args:
+            commands: 要依序執行的 RCON 指令列表。
+            read_timeout: 每個指令讀取回應的超時秒數（預設 3.5 秒）。
+
+        Returns:
+            與 commands 順序對應的回應文字列表。
+        """
+        return [self.execute_simple(command, read_timeout)[0] for command in commands]
+
     def close(self) -> None:
         """關閉 RCON 連線。"""
         if self._sock:
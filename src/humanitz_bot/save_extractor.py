@@ -17,12 +17,13 @@ import sys
 import time
 from pathlib import Path
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] save_extractor: %(message)s",
-)
 logger = logging.getLogger("save_extractor")
 
+# 精簡 JSON 的 players 陣列開頭；表頭行以此結尾，之後每位玩家一行
+# （SaveService 匯入此常數逐行串流讀取）
+PLAYERS_OPEN = ', "players": ['
+
+
 def _safe_int(val: object, default: int = 0) -> int:
     """安全的 int 轉換，轉換失敗時回傳預設值。"""
     try:
@@ -160,7 +161,10 @@ def _extract_player(player: dict) -> dict | None:
         "is_male": bool(is_male) if is_male is not None else True,
     }
     result.update(kill_stats)
-    result["challenges"] = challenges
+    # 直接輸出 DB 欄位所需的 JSON 字串，主程序匯入時不必再解析、重新序列化
+    result["challenges_json"] = (
+        json.dumps(challenges, ensure_ascii=False) if challenges else "{}"
+    )
 
     return result
 
@@ -210,8 +214,7 @@ def extract(input_path: str, output_path: str) -> None:
     if not isinstance(random_seed, int):
         random_seed = _safe_int(random_seed)
 
-    result = {
-        "players": players,
+    header = {
         "game_state": {
             "days_passed": days_passed,
             "season_day": season_day,
@@ -224,11 +227,16 @@ def extract(input_path: str, output_path: str) -> None:
         },
     }
 
-    # 寫入精簡 JSON
+    # 寫入精簡 JSON：第一行為 game_state/meta 並開啟 players 陣列，之後每位玩家一行。
+    # 整體仍是合法 JSON；主程序可逐行解析玩家，不必一次載入整個檔案。
     output = Path(output_path)
     output.parent.mkdir(parents=True, exist_ok=True)
     with open(output, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False)
+        f.write(json.dumps(header, ensure_ascii=False)[:-1] + PLAYERS_OPEN)
+        for i, player in enumerate(players):
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(player, ensure_ascii=False))
+        f.write("\n]}\n")
 
     elapsed = time.monotonic() - start
     output_size = output.stat().st_size
@@ -242,6 +250,11 @@ def extract(input_path: str, output_path: str) -> None:
 
 def main() -> None:
     """子程序進入點。"""
+    # logging 只在子程序設定 — 主程序匯入本模組（取用 PLAYERS_OPEN）時不可覆寫其 logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] save_extractor: %(message)s",
+    )
     if len(sys.argv) != 3:
         print(
             f"Usage: {sys.argv[0]} <input_json_path> <output_json_path>",
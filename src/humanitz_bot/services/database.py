@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import logging
+import queue
 import sqlite3
 import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import batched
 from pathlib import Path
 
 logger = logging.getLogger("humanitz_bot.services.database")
@@ -12,13 +18,13 @@ _DB_FILENAME = "humanitz_bot.db"
 
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS player_count (
-    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    id        INTEGER PRIMARY KEY,
     timestamp TEXT    NOT NULL,
     count     INTEGER NOT NULL
 );
 
 CREATE TABLE IF NOT EXISTS chat_log (
-    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    id          INTEGER PRIMARY KEY,
     timestamp   TEXT    NOT NULL,
     event_type  TEXT    NOT NULL,
     player_name TEXT    NOT NULL DEFAULT '',
@@ -26,7 +32,7 @@ CREATE TABLE IF NOT EXISTS chat_log (
 );
 
 CREATE TABLE IF NOT EXISTS player_sessions (
-    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    id          INTEGER PRIMARY KEY,
     timestamp   TEXT    NOT NULL,
     player_name TEXT    NOT NULL,
     event_type  TEXT    NOT NULL
@@ -35,7 +41,11 @@ CREATE TABLE IF NOT EXISTS player_sessions (
 CREATE INDEX IF NOT EXISTS idx_player_count_ts ON player_count(timestamp);
 CREATE INDEX IF NOT EXISTS idx_chat_log_ts ON chat_log(timestamp);
 CREATE INDEX IF NOT EXISTS idx_player_sessions_ts ON player_sessions(timestamp);
-CREATE INDEX IF NOT EXISTS idx_player_sessions_name ON player_sessions(player_name);
+-- 沒有任何查詢以 player_name 篩選 player_sessions，移除多餘索引以減少寫入維護成本
+DROP INDEX IF EXISTS idx_player_sessions_name;
+-- get_death_count 專用的部分索引：只收錄死亡事件，範圍掃描不需逐列過濾 event_type
+CREATE INDEX IF NOT EXISTS idx_player_sessions_died_ts
+    ON player_sessions(timestamp) WHERE event_type = 'player_died';
 
 CREATE TABLE IF NOT EXISTS save_players (
     steam_id        TEXT    PRIMARY KEY,
@@ -63,7 +73,7 @@ CREATE TABLE IF NOT EXISTS save_players (
     times_bitten    INTEGER NOT NULL DEFAULT 0,
     challenges_json TEXT    NOT NULL DEFAULT '{}',
     updated_at      TEXT    NOT NULL
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS save_game_state (
     id            INTEGER PRIMARY KEY CHECK (id = 1),
@@ -71,7 +81,7 @@ CREATE TABLE IF NOT EXISTS save_game_state (
     season_day    INTEGER NOT NULL DEFAULT 0,
     random_seed   INTEGER NOT NULL DEFAULT 0,
     updated_at    TEXT    NOT NULL
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS save_meta (
     id              INTEGER PRIMARY KEY CHECK (id = 1),
@@ -79,50 +89,387 @@ CREATE TABLE IF NOT EXISTS save_meta (
     parse_duration  REAL    NOT NULL DEFAULT 0,
     save_file_mtime TEXT,
     player_count    INTEGER NOT NULL DEFAULT 0
-);
+) WITHOUT ROWID;
 
 CREATE TABLE IF NOT EXISTS player_identity (
     steam_id    TEXT    PRIMARY KEY,
     player_name TEXT    NOT NULL,
     eos_id      TEXT    NOT NULL DEFAULT '',
     updated_at  TEXT    NOT NULL
-);
-
-CREATE INDEX IF NOT EXISTS idx_player_identity_name ON player_identity(player_name);
-CREATE INDEX IF NOT EXISTS idx_save_players_days ON save_players(survival_days DESC);
-CREATE INDEX IF NOT EXISTS idx_save_players_kills ON save_players(zombies_killed DESC);
+) WITHOUT ROWID;
+
+-- 名稱查詢一律大小寫不敏感（WHERE player_name = ? COLLATE NOCASE），索引需使用相同 collation
+DROP INDEX IF EXISTS idx_player_identity_name;
+CREATE INDEX IF NOT EXISTS idx_player_identity_name_nocase
+    ON player_identity(player_name COLLATE NOCASE);
+
+-- 排行榜覆蓋索引：查詢欄位全部在索引內，不需回主表逐列查找
+DROP INDEX IF EXISTS idx_save_players_days;
+DROP INDEX IF EXISTS idx_save_players_kills;
+CREATE INDEX IF NOT EXISTS idx_save_players_days_cover
+    ON save_players(survival_days DESC, steam_id);
+CREATE INDEX IF NOT EXISTS idx_save_players_kills_cover
+    ON save_players(
+        zombies_killed DESC, steam_id, headshots, melee_kills, gun_kills,
+        blast_kills, fist_kills, vehicle_kills, takedown_kills
+    );
 """
 
+# 以主鍵查詢為主的資料表 — 使用 WITHOUT ROWID 省去 rowid 與主鍵索引的二次查找
+_WITHOUT_ROWID_TABLES = ("save_players", "save_game_state", "save_meta", "player_identity")
+
+# 高頻寫入的歷史資料表 — 不使用 AUTOINCREMENT，省去每次 INSERT 更新 sqlite_sequence
+_HISTORY_TABLES = ("player_count", "chat_log", "player_sessions")
+
+# 排行榜實際顯示的欄位（須與上方覆蓋索引、save_service 的 SurvivalRankEntry / KillRankEntry 欄位順序保持一致）
+_SAVE_LEADERBOARD_COLUMNS = "steam_id, survival_days"
+_KILL_LEADERBOARD_COLUMNS = (
+    "steam_id, zombies_killed, headshots, melee_kills, gun_kills, "
+    "blast_kills, fist_kills, vehicle_kills, takedown_kills"
+)
+
+# save_players 寫入欄位順序（upsert_save_players_many 的 row tuple 依此排列，不含 updated_at）
+_SAVE_PLAYER_COLUMNS = (
+    "steam_id", "x", "y", "z", "health", "hunger", "thirst", "stamina", "infection",
+    "bites", "survival_days", "profession", "is_male",
+    "zombies_killed", "headshots", "melee_kills", "gun_kills", "blast_kills",
+    "fist_kills", "vehicle_kills", "takedown_kills", "fish_caught", "times_bitten",
+    "challenges_json",
+)
+
+# 預先建構的 SQL 字串 — 同一個字串物件重複使用，讓 sqlite3 statement cache 持續命中
+_SQL_INSERT_PLAYER_COUNT = "INSERT INTO player_count (timestamp, count) VALUES (?, ?)"
+_SQL_SELECT_PLAYER_COUNT = (
+    "SELECT timestamp, count FROM player_count WHERE timestamp >= ? ORDER BY timestamp"
+)
+_SQL_INSERT_CHAT = (
+    "INSERT INTO chat_log (timestamp, event_type, player_name, message) VALUES (?, ?, ?, ?)"
+)
+_SQL_INSERT_SESSION = (
+    "INSERT INTO player_sessions (timestamp, player_name, event_type) VALUES (?, ?, ?)"
+)
+_SQL_COUNT_DEATHS = (
+    "SELECT COUNT(*) AS cnt FROM player_sessions "
+    "WHERE event_type = 'player_died' AND timestamp >= ?"
+)
+# 分批刪除（DELETE ... LIMIT 需要特殊編譯選項，改用子查詢限制筆數）
+_SQL_PRUNE = {
+    table: (
+        f"DELETE FROM {table} WHERE id IN "
+        f"(SELECT id FROM {table} WHERE timestamp < ? LIMIT ?)"
+    )
+    for table in _HISTORY_TABLES
+}
+_SQL_UPSERT_SAVE_PLAYER = (
+    f"INSERT OR REPLACE INTO save_players ({', '.join(_SAVE_PLAYER_COLUMNS)}, updated_at) "
+    f"VALUES ({', '.join('?' * (len(_SAVE_PLAYER_COLUMNS) + 1))})"
+)
+_SQL_UPSERT_GAME_STATE = (
+    "INSERT OR REPLACE INTO save_game_state "
+    "(id, days_passed, season_day, random_seed, updated_at) "
+    "VALUES (1, ?, ?, ?, ?)"
+)
+_SQL_UPSERT_SAVE_META = (
+    "INSERT OR REPLACE INTO save_meta "
+    "(id, last_parse_time, parse_duration, save_file_mtime, player_count) "
+    "VALUES (1, ?, ?, ?, ?)"
+)
+_SQL_SELECT_SAVE_META = "SELECT * FROM save_meta WHERE id = 1"
+_SQL_SELECT_SAVE_PLAYER = "SELECT * FROM save_players WHERE steam_id = ?"
+_SQL_SELECT_SAVE_PLAYER_WITH_IDENTITY = (
+    "SELECT sp.*, COALESCE(pi.player_name, '') AS player_name, "
+    "COALESCE(pi.eos_id, '') AS eos_id "
+    "FROM save_players sp LEFT JOIN player_identity pi USING (steam_id) "
+    "WHERE sp.steam_id = ?"
+)
+_SQL_SAVE_LEADERBOARD = (
+    f"SELECT {_SAVE_LEADERBOARD_COLUMNS} FROM save_players "
+    "ORDER BY survival_days DESC LIMIT ?"
+)
+_SQL_KILL_LEADERBOARD = (
+    f"SELECT {_KILL_LEADERBOARD_COLUMNS} FROM save_players "
+    "ORDER BY zombies_killed DESC LIMIT ?"
+)
+_SQL_SELECT_GAME_STATE = "SELECT * FROM save_game_state WHERE id = 1"
+_SQL_UPSERT_IDENTITY = (
+    "INSERT OR REPLACE INTO player_identity "
+    "(steam_id, player_name, eos_id, updated_at) "
+    "VALUES (?, ?, ?, ?)"
+)
+# 多列 VALUES 批次 upsert：每列 4 個參數，200 列 = 800 個，低於舊版 SQLite 的 999 上限
+_IDENTITY_UPSERT_CHUNK = 200
+
+
+@lru_cache(maxsize=4)
+def _sql_upsert_identities(n: int) -> str:
+    """產生一次寫入 n 列的 player_identity upsert 語句。"""
+    return (
+        "INSERT INTO player_identity (steam_id, player_name, eos_id, updated_at) "
+        "VALUES " + ", ".join(["(?, ?, ?, ?)"] * n) + " "
+        "ON CONFLICT(steam_id) DO UPDATE SET "
+        "player_name = excluded.player_name, eos_id = excluded.eos_id, "
+        "updated_at = excluded.updated_at"
+    )
+
+
+_SQL_IDENTITY_BY_NAME_NOCASE = (
+    "SELECT steam_id, player_name FROM player_identity "
+    "WHERE player_name = ? COLLATE NOCASE"
+)
+_SQL_NAME_BY_STEAM_ID = "SELECT player_name FROM player_identity WHERE steam_id = ?"
+_SQL_EOS_ID_BY_STEAM_ID = "SELECT eos_id FROM player_identity WHERE steam_id = ?"
+_SQL_ALL_IDENTITIES = "SELECT * FROM player_identity ORDER BY updated_at DESC"
+
+# sqlite3 預設 statement cache 為 128，放大以容納所有常用語句
+_CACHED_STATEMENTS = 256
+
+# 每條連線開啟時設定的 PRAGMA（皆為連線層級，不會持久化到 DB 檔案）
+_CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=67108864",  # 64 MiB
+    "PRAGMA cache_size=-20000",  # 約 20 MB page cache
+)
+
+# 唯讀連線池大小
+_READ_POOL_SIZE = 4
+
+# 背景寫入佇列：累積到此筆數或等待超過此秒數即寫入一次
+_WRITE_QUEUE_BATCH = 100
+_WRITE_QUEUE_LINGER = 0.2
+
+# PRAGMA optimize 觸發的 ANALYZE 每個索引最多抽樣的列數（限制在毫秒級成本）
+_ANALYSIS_LIMIT = 1000
+
+# prune_old_data 每批刪除筆數；單次清除超過此數量時順便 checkpoint 縮小 -wal 檔
+_PRUNE_BATCH_SIZE = 5000
+
+# (epoch 秒, ISO 字串到秒) — 同一秒內的寫入共用已格式化的日期時間部分
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def _now_iso() -> str:
+    """回傳本地時間 ISO 8601 字串（微秒精度），同一秒內重複使用已格式化的日期時間部分。
+
+    輸出與 datetime.now().isoformat() 相同（微秒固定 6 位），保留同秒事件的先後順序，
+    但省去每次寫入建立 datetime 物件與完整格式化的成本。
+    """
+    global _ts_cache
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, cached_str = _ts_cache
+    if sec != cached_sec:
+        cached_str = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+        _ts_cache = (sec, cached_str)
+    return f"{cached_str}.{us:06d}"
+
 
 class Database:
-    def __init__(self, data_dir: str = "data", retention_days: int = 30) -> None:
+    """SQLite 存取層 — 單一寫入連線 + 唯讀連線池。
+
+    WAL 模式下讀取不會被寫入阻擋，因此只有寫入需要序列化（_write_lock）；
+    查詢從唯讀連線池取用連線，不與資料收集的寫入互相等待。
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        retention_days: int = 30,
+        read_pool_size: int = _READ_POOL_SIZE,
+    ) -> None:
         self._db_path = Path(data_dir) / _DB_FILENAME
         Path(data_dir).mkdir(parents=True, exist_ok=True)
         self._retention = timedelta(days=retention_days)
-        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # _stopping：close() 開始後拒絕排入佇列；_state_lock 保證停止訊號之後不會再有項目排入
+        # _closed：背景寫入排空、連線關閉後拒絕所有寫入/查詢（在 _write_lock 下設定與檢查）
+        self._stopping = False
+        self._closed = False
+        self._state_lock = threading.Lock()
+        self._write_conn = self._connect()
         self._init_db()
+        # 唯讀連線需在 schema 建立後開啟（mode=ro 無法建立資料庫檔案）
+        self._read_pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._read_pool_size = read_pool_size
+        for _ in range(read_pool_size):
+            self._read_pool.put(self._connect(read_only=True))
+        # 聊天/連線事件走背景寫入佇列：呼叫端只需 put()，由單一執行緒批次寫入
+        # 項目為 (sql, params)；threading.Event 為 flush 標記；None 為停止訊號
+        self._write_q: queue.SimpleQueue[
+            tuple[str, tuple[object, ...]] | threading.Event | None
+        ] = queue.SimpleQueue()
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="db-writer", daemon=True
+        )
+        self._writer_thread.start()
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """建立 SQLite 連線並套用 _CONNECTION_PRAGMAS（journal_mode 等 DB 層級設定在 _init_db）。
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """建立 SQLite 連線（不含 PRAGMA，PRAGMA 在 _init_db 設定一次）。"""
-        conn = sqlite3.connect(str(self._db_path), timeout=10)
+        timeout 即 busy_timeout — 遇到鎖定時等待而非立即報錯。
+        連線會在 asyncio.to_thread 的不同執行緒間共用，由 _write_lock / 連線池保證同時只有一個使用者。
+        """
+        if read_only:
+            target = self._db_path.resolve().as_uri() + "?mode=ro"
+        else:
+            target = str(self._db_path)
+        conn = sqlite3.connect(
+            target,
+            timeout=10,
+            cached_statements=_CACHED_STATEMENTS,
+            check_same_thread=False,
+            uri=read_only,
+        )
         conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
 
-    def _init_db(self) -> None:
-        with self._lock:
-            conn = self._get_conn()
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """取得寫入連線 — 持有 _write_lock，離開時 commit（例外時 rollback）；close() 後拋出 RuntimeError。"""
+        with self._write_lock:
+            if self._closed:
+                raise RuntimeError("Database is closed")
+            with self._write_conn:
+                yield self._write_conn
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """從唯讀連線池借出一條連線，用完歸還（close() 後直接拋出 RuntimeError）。"""
+        if self._closed:
+            raise RuntimeError("Database is closed")
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    def _writer_loop(self) -> None:
+        """背景寫入執行緒 — 每批最多 _WRITE_QUEUE_BATCH 筆或等待 _WRITE_QUEUE_LINGER 秒。"""
+        while True:
+            item = self._write_q.get()
+            batch: list[tuple[str, tuple[object, ...]]] = []
+            waiters: list[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + _WRITE_QUEUE_LINGER
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break  # flush 標記：立即寫入目前累積的資料
+                batch.append(item)
+                if len(batch) >= _WRITE_QUEUE_BATCH:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._write_q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            # 任何例外都不可讓執行緒結束，否則佇列無人消化、flush() 永遠等不到
             try:
-                # WAL 模式與 synchronous 只需設定一次（持久性設定）
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                # Migration 必須在 executescript 之前執行，
-                # 因為 _SCHEMA 中的 CREATE INDEX 引用了新欄位。
-                self._migrate_save_players(conn)
-                conn.executescript(_SCHEMA)
-                conn.commit()
-                logger.info("Database initialized: %s", self._db_path)
+                if batch:
+                    self._write_batch(batch)
+            except Exception:
+                logger.exception("DB writer failed on a batch of %d events", len(batch))
             finally:
-                conn.close()
+                for waiter in waiters:
+                    waiter.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: list[tuple[str, tuple[object, ...]]]) -> None:
+        """將佇列中的事件依 SQL 分組，在單一交易中以 executemany 寫入。
+
+        整批失敗時改為逐筆寫入，只有本身寫不進去的事件會被捨棄（並記錄內容）。
+        """
+        grouped: dict[str, list[tuple[object, ...]]] = {}
+        for sql, params in batch:
+            grouped.setdefault(sql, []).append(params)
+        try:
+            with self._writer() as conn:
+                for sql, rows in grouped.items():
+                    conn.executemany(sql, rows)
+            return
+        except Exception:
+            logger.warning(
+                "Batch write of %d queued events failed, retrying one by one",
+                len(batch),
+                exc_info=True,
+            )
+        for sql, params in batch:
+            try:
+                with self._writer() as conn:
+                    conn.execute(sql, params)
+            except Exception:
+                logger.exception("Dropped queued event %r", params)
+
+    def _enqueue(self, sql: str, params: tuple[object, ...]) -> None:
+        """排入背景寫入佇列；close() 後拋出 RuntimeError 而非排入無人消化的佇列。"""
+        with self._state_lock:
+            if self._stopping:
+                raise RuntimeError("Database is closed")
+            self._write_q.put((sql, params))
+
+    def flush(self, timeout: float | None = None) -> None:
+        """等待背景寫入佇列中已排入的事件全部寫入 DB。"""
+        done = threading.Event()
+        with self._state_lock:
+            if self._stopping:
+                return
+            self._write_q.put(done)
+        done.wait(timeout)
+
+    def optimize(self) -> None:
+        """執行 PRAGMA optimize — 只對統計資料過時的資料表做 ANALYZE，讓查詢規劃器選對索引。"""
+        with self._write_lock:
+            if self._closed:
+                raise RuntimeError("Database is closed")
+            self._write_conn.execute("PRAGMA optimize")
+
+    def close(self) -> None:
+        """寫入佇列剩餘事件並關閉所有連線（由 bot 關閉流程呼叫，重複呼叫無作用）。"""
+        with self._state_lock:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._write_q.put(None)
+        self._writer_thread.join(timeout=10)
+        if self._writer_thread.is_alive():
+            logger.warning("DB writer did not finish within 10s, closing anyway")
+        with self._write_lock:
+            self._closed = True
+            try:
+                self._write_conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                logger.warning("PRAGMA optimize on close failed", exc_info=True)
+            self._write_conn.close()
+        # 等借出中的唯讀連線歸還後再關閉（_closed 已阻止新的借用）
+        for _ in range(self._read_pool_size):
+            try:
+                self._read_pool.get(timeout=10).close()
+            except queue.Empty:
+                logger.warning("Read connection not returned within 10s, skipping")
+                break
+        logger.info("Database connections closed")
+
+    def _init_db(self) -> None:
+        with self._writer() as conn:
+            # journal_mode=WAL 會持久化到 DB 檔案；synchronous 是連線層級設定，
+            # 因寫入連線常駐，在此設定一次即涵蓋所有寫入
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # analysis_limit 是連線層級設定，只有寫入連線會執行 PRAGMA optimize
+            conn.execute(f"PRAGMA analysis_limit={_ANALYSIS_LIMIT}")
+            # Migration 必須在 executescript 之前執行，
+            # 因為 _SCHEMA 中的 CREATE INDEX 引用了新欄位。
+            self._migrate_save_players(conn)
+            rebuilt = self._detach_outdated_tables(conn)
+            conn.executescript(_SCHEMA)
+            self._refill_rebuilt_tables(conn, rebuilt)
+            logger.info("Database initialized: %s", self._db_path)
 
     def _migrate_save_players(self, conn: sqlite3.Connection) -> None:
         """Schema migration — 為現有 save_players 資料表新增擊殺/挑戰欄位。
@@ -161,91 +508,145 @@ class Database:
                 else:
                     raise
 
+    def _detach_outdated_tables(self, conn: sqlite3.Connection) -> list[str]:
+        """Schema migration — 將定義過時的資料表改名，讓 _SCHEMA 建立新版本。
+
+        過時的定義：_WITHOUT_ROWID_TABLES 仍為 rowid 表、_HISTORY_TABLES 仍使用 AUTOINCREMENT。
+        舊表的索引一併刪除，避免與 _SCHEMA 中同名索引衝突。
+        資料在 _refill_rebuilt_tables() 中搬回新表。
+
+        改名與搬移之間有 executescript 的隱含 commit，無法包在同一交易中；
+        若上次在搬移完成前中斷，啟動時會發現殘留的 *_old 表並接續搬移。
+
+        Returns:
+            需要搬移資料的資料表名稱列表。
+        """
+        rebuilt: list[str] = []
+        for table in _WITHOUT_ROWID_TABLES + _HISTORY_TABLES:
+            old_table = f"{table}_old"
+            if self._table_sql(conn, old_table) is not None:
+                # 上次 migration 中斷：舊表仍保有完整資料，新表（若存在）尚未提交任何搬移
+                self._drop_indexes(conn, old_table)
+                logger.warning("Migration: resuming interrupted rebuild of %s", table)
+                rebuilt.append(table)
+                continue
+            sql = self._table_sql(conn, table)
+            if sql is None:
+                continue  # 全新 DB
+            sql = sql.upper()
+            if table in _WITHOUT_ROWID_TABLES and "WITHOUT ROWID" in sql:
+                continue  # 已轉換
+            if table in _HISTORY_TABLES and "AUTOINCREMENT" not in sql:
+                continue  # 已轉換
+            self._drop_indexes(conn, table)
+            conn.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+            rebuilt.append(table)
+        return rebuilt
+
+    @staticmethod
+    def _table_sql(conn: sqlite3.Connection, table: str) -> str | None:
+        """回傳資料表的 CREATE 語句，不存在時回傳 None。"""
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?",
+            (table,),
+        ).fetchone()
+        return row["sql"] if row else None
+
+    @staticmethod
+    def _drop_indexes(conn: sqlite3.Connection, table: str) -> None:
+        """刪除資料表上的具名索引（不含主鍵/UNIQUE 自動索引）。"""
+        index_names = [
+            r["name"]
+            for r in conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                (table,),
+            )
+        ]
+        for name in index_names:
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    def _refill_rebuilt_tables(
+        self, conn: sqlite3.Connection, tables: list[str]
+    ) -> None:
+        """將舊資料表的資料搬入新建的資料表並刪除舊表（sqlite_sequence 紀錄隨舊表一併移除）。
+
+        所有資料表的搬移與 DROP 在同一交易中完成 — 中斷時舊表原封不動，下次啟動接續。
+        INSERT OR REPLACE 讓重複搬移保持冪等。
+        """
+        if not tables:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        for table in tables:
+            old_table = f"{table}_old"
+            new_cols = {r["name"] for r in conn.execute(f"PRAGMA table_info({table})")}
+            cols = ", ".join(
+                r["name"]
+                for r in conn.execute(f"PRAGMA table_info({old_table})")
+                if r["name"] in new_cols
+            )
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({cols}) SELECT {cols} FROM {old_table}"
+            )
+            conn.execute(f"DROP TABLE {old_table}")
+            logger.info("Migration: rebuilt table %s", table)
+
     def add_player_count(self, count: int) -> None:
-        ts = datetime.now().isoformat()
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                conn.execute(
-                    "INSERT INTO player_count (timestamp, count) VALUES (?, ?)",
-                    (ts, count),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+        ts = _now_iso()
+        with self._writer() as conn:
+            conn.execute(_SQL_INSERT_PLAYER_COUNT, (ts, count))
 
-    def get_player_count_history(self, hours: int = 24) -> list[tuple[str, int]]:
+    def get_player_count_history(self, hours: int = 24) -> list[sqlite3.Row]:
+        """回傳 (timestamp, count) 列 — sqlite3.Row 可直接 tuple 解包。"""
         cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                rows = conn.execute(
-                    "SELECT timestamp, count FROM player_count WHERE timestamp >= ? ORDER BY timestamp",
-                    (cutoff,),
-                ).fetchall()
-                return [(r["timestamp"], r["count"]) for r in rows]
-            finally:
-                conn.close()
+        with self._reader() as conn:
+            return conn.execute(_SQL_SELECT_PLAYER_COUNT, (cutoff,)).fetchall()
 
     def add_chat_event(
         self, event_type: str, player_name: str = "", message: str = ""
     ) -> None:
-        ts = datetime.now().isoformat()
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                conn.execute(
-                    "INSERT INTO chat_log (timestamp, event_type, player_name, message) VALUES (?, ?, ?, ?)",
-                    (ts, event_type, player_name, message),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+        """排入聊天記錄（非阻塞，由背景執行緒批次寫入）。"""
+        self._enqueue(
+            _SQL_INSERT_CHAT, (_now_iso(), event_type, player_name, message)
+        )
 
     def add_player_session_event(self, player_name: str, event_type: str) -> None:
-        ts = datetime.now().isoformat()
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                conn.execute(
-                    "INSERT INTO player_sessions (timestamp, player_name, event_type) VALUES (?, ?, ?)",
-                    (ts, player_name, event_type),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+        """排入玩家連線/死亡事件（非阻塞，由背景執行緒批次寫入）。"""
+        self._enqueue(_SQL_INSERT_SESSION, (_now_iso(), player_name, event_type))
 
     def get_death_count(self, hours: int = 24) -> int:
         cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT COUNT(*) AS cnt FROM player_sessions "
-                    "WHERE event_type = 'player_died' AND timestamp >= ?",
-                    (cutoff,),
-                ).fetchone()
-                return row["cnt"] if row else 0
-            finally:
-                conn.close()
+        with self._reader() as conn:
+            row = conn.execute(_SQL_COUNT_DEATHS, (cutoff,)).fetchone()
+            return row["cnt"] if row else 0
 
     def prune_old_data(self) -> int:
+        """清除超過保留期限的歷史資料，回傳刪除筆數。
+
+        三張表在同一個 BEGIN IMMEDIATE 交易中分批刪除 —
+        一開始就取得寫入鎖，避免 deferred 交易中途升級造成 database is locked。
+        """
         cutoff = (datetime.now() - self._retention).isoformat()
         total = 0
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                for table in ("player_count", "chat_log", "player_sessions"):
-                    cursor = conn.execute(
-                        f"DELETE FROM {table} WHERE timestamp < ?", (cutoff,)
-                    )
+        with self._writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql in _SQL_PRUNE.values():
+                while True:
+                    cursor = conn.execute(sql, (cutoff, _PRUNE_BATCH_SIZE))
                     total += cursor.rowcount
-                # 注意：不清除 player_identity（身份是參考資料，應永久保留）
-                conn.commit()
-                if total > 0:
-                    logger.info("Pruned %d old records (cutoff: %s)", total, cutoff)
-            finally:
-                conn.close()
+                    if cursor.rowcount < _PRUNE_BATCH_SIZE:
+                        break
+            # 注意：不清除 player_identity（身份是參考資料，應永久保留）
+        if total > 0:
+            logger.info("Pruned %d old records (cutoff: %s)", total, cutoff)
+        if total >= _PRUNE_BATCH_SIZE:
+            # 大量刪除後截斷 WAL，避免 -wal 檔只增不減（checkpoint 不可在交易中執行）
+            with self._write_lock:
+                if self._closed:
+                    raise RuntimeError("Database is closed")
+                self._write_conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        # 清除後資料分佈變化最大，順便更新統計資料（prune 每小時排程一次）
+        self.optimize()
         return total
 
     def upsert_save_player(
@@ -275,46 +676,65 @@ class Database:
         times_bitten: int = 0,
         challenges_json: str = "{}",
     ) -> None:
-        ts = datetime.now().isoformat()
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                conn.execute(
-                    "INSERT OR REPLACE INTO save_players "
-                    "(steam_id, x, y, z, health, hunger, thirst, stamina, infection, "
-                    "bites, survival_days, profession, is_male, "
-                    "zombies_killed, headshots, melee_kills, gun_kills, blast_kills, "
-                    "fist_kills, vehicle_kills, takedown_kills, fish_caught, times_bitten, "
-                    "challenges_json, updated_at) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        steam_id, x, y, z, health, hunger, thirst, stamina, infection,
-                        bites, survival_days, profession, int(is_male),
-                        zombies_killed, headshots, melee_kills, gun_kills, blast_kills,
-                        fist_kills, vehicle_kills, takedown_kills, fish_caught, times_bitten,
-                        challenges_json, ts,
-                    ),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+        ts = _now_iso()
+        with self._writer() as conn:
+            conn.execute(
+                _SQL_UPSERT_SAVE_PLAYER,
+                (
+                    steam_id, x, y, z, health, hunger, thirst, stamina, infection,
+                    bites, survival_days, profession, int(is_male),
+                    zombies_killed, headshots, melee_kills, gun_kills, blast_kills,
+                    fist_kills, vehicle_kills, takedown_kills, fish_caught, times_bitten,
+                    challenges_json, ts,
+                ),
+            )
+
+    def upsert_save_players_many(self, rows: Iterable[Sequence[object]]) -> int:
+        """以單一 BEGIN IMMEDIATE 交易批次寫入多筆玩家存檔資料（只 commit / fsync 一次）。
+
+        executemany 重用同一個已編譯語句；rows 可為 generator，邊讀邊寫。
+
+        Args:
+            rows: 每筆依 _SAVE_PLAYER_COLUMNS 順序排列的欄位值（不含 updated_at）
+
+        Returns:
+            寫入的筆數。
+        """
+        ts = _now_iso()
+        with self._writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.executemany(
+                _SQL_UPSERT_SAVE_PLAYER, ((*row, ts) for row in rows)
+            )
+            return cursor.rowcount
+
+    def upsert_save_players_each(self, rows: Iterable[Sequence[object]]) -> int:
+        """upsert_save_players_many 的逐筆版本 — 單筆失敗只略過該筆，其餘仍在同一交易中提交。
+
+        Returns:
+            實際寫入的筆數。
+        """
+        ts = _now_iso()
+        written = 0
+        with self._writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for row in rows:
+                try:
+                    conn.execute(_SQL_UPSERT_SAVE_PLAYER, (*row, ts))
+                except sqlite3.Error:
+                    logger.warning("Failed to upsert save player %s: skipping", row[0], exc_info=True)
+                    continue
+                written += 1
+        return written
 
     def upsert_save_game_state(
         self, days_passed: int, season_day: int, random_seed: int
     ) -> None:
-        ts = datetime.now().isoformat()
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                conn.execute(
-                    "INSERT OR REPLACE INTO save_game_state "
-                    "(id, days_passed, season_day, random_seed, updated_at) "
-                    "VALUES (1, ?, ?, ?, ?)",
-                    (days_passed, season_day, random_seed, ts),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+        ts = _now_iso()
+        with self._writer() as conn:
+            conn.execute(
+                _SQL_UPSERT_GAME_STATE, (days_passed, season_day, random_seed, ts)
+            )
 
     def upsert_save_meta(
         self,
@@ -323,126 +743,95 @@ class Database:
         save_file_mtime: str | None,
         player_count: int,
     ) -> None:
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                conn.execute(
-                    "INSERT OR REPLACE INTO save_meta "
-                    "(id, last_parse_time, parse_duration, save_file_mtime, player_count) "
-                    "VALUES (1, ?, ?, ?, ?)",
-                    (last_parse_time, parse_duration, save_file_mtime, player_count),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+        with self._writer() as conn:
+            conn.execute(
+                _SQL_UPSERT_SAVE_META,
+                (last_parse_time, parse_duration, save_file_mtime, player_count),
+            )
 
     def get_save_meta(self) -> dict | None:
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT * FROM save_meta WHERE id = 1"
-                ).fetchone()
-                return dict(row) if row else None
-            finally:
-                conn.close()
+        with self._reader() as conn:
+            row = conn.execute(_SQL_SELECT_SAVE_META).fetchone()
+            return dict(row) if row else None
 
     def get_save_player(self, steam_id: str) -> dict | None:
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT * FROM save_players WHERE steam_id = ?",
-                    (steam_id,),
-                ).fetchone()
-                return dict(row) if row else None
-            finally:
-                conn.close()
+        with self._reader() as conn:
+            row = conn.execute(_SQL_SELECT_SAVE_PLAYER, (steam_id,)).fetchone()
+            return dict(row) if row else None
 
-    def get_save_leaderboard(self, limit: int = 10) -> list[dict]:
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                rows = conn.execute(
-                    "SELECT * FROM save_players ORDER BY survival_days DESC LIMIT ?",
-                    (limit,),
-                ).fetchall()
-                return [dict(r) for r in rows]
-            finally:
-                conn.close()
+    def get_save_player_with_identity(self, steam_id: str) -> sqlite3.Row | None:
+        """查詢玩家存檔資料並一併帶出 player_identity 的名稱與 EOS ID（單次 JOIN 查詢）。"""
+        with self._reader() as conn:
+            return conn.execute(
+                _SQL_SELECT_SAVE_PLAYER_WITH_IDENTITY, (steam_id,)
+            ).fetchone()
 
-    def get_kill_leaderboard(self, limit: int = 10) -> list[dict]:
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                rows = conn.execute(
-                    "SELECT * FROM save_players ORDER BY zombies_killed DESC LIMIT ?",
-                    (limit,),
-                ).fetchall()
-                return [dict(r) for r in rows]
-            finally:
-                conn.close()
+    def get_save_leaderboard(self, limit: int = 10) -> list[sqlite3.Row]:
+        with self._reader() as conn:
+            return conn.execute(_SQL_SAVE_LEADERBOARD, (limit,)).fetchall()
+
+    def get_kill_leaderboard(self, limit: int = 10) -> list[sqlite3.Row]:
+        with self._reader() as conn:
+            return conn.execute(_SQL_KILL_LEADERBOARD, (limit,)).fetchall()
 
     def get_save_game_state(self) -> dict | None:
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT * FROM save_game_state WHERE id = 1"
-                ).fetchone()
-                return dict(row) if row else None
-            finally:
-                conn.close()
+        with self._reader() as conn:
+            row = conn.execute(_SQL_SELECT_GAME_STATE).fetchone()
+            return dict(row) if row else None
 
     def upsert_player_identity(
         self, steam_id: str, player_name: str, eos_id: str = ""
     ) -> None:
-        ts = datetime.now().isoformat()
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                conn.execute(
-                    "INSERT OR REPLACE INTO player_identity "
-                    "(steam_id, player_name, eos_id, updated_at) "
-                    "VALUES (?, ?, ?, ?)",
-                    (steam_id, player_name, eos_id, ts),
-                )
-                conn.commit()
-            finally:
-                conn.close()
+        ts = _now_iso()
+        with self._writer() as conn:
+            conn.execute(_SQL_UPSERT_IDENTITY, (steam_id, player_name, eos_id, ts))
 
-    def get_steam_id_by_name(self, player_name: str) -> str | None:
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT steam_id FROM player_identity WHERE player_name = ?",
-                    (player_name,),
-                ).fetchone()
-                return row["steam_id"] if row else None
-            finally:
-                conn.close()
+    def upsert_player_identities_bulk(
+        self, rows: Iterable[tuple[str, str, str]]
+    ) -> int:
+        """以單一 BEGIN IMMEDIATE 交易批次寫入玩家身份（只 commit / fsync 一次）。
+
+        每 _IDENTITY_UPSERT_CHUNK 列合併為一條多列 VALUES 語句執行。
+
+        Args:
+            rows: (steam_id, player_name, eos_id) 列表
+
+        Returns:
+            寫入的筆數。
+        """
+        ts = _now_iso()
+        written = 0
+        with self._writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for chunk in batched(rows, _IDENTITY_UPSERT_CHUNK):
+                params = [
+                    value
+                    for steam_id, name, eos_id in chunk
+                    for value in (steam_id, name, eos_id, ts)
+                ]
+                conn.execute(_sql_upsert_identities(len(chunk)), params)
+                written += len(chunk)
+        return written
+
+    def get_steam_id_by_name_nocase(self, player_name: str) -> sqlite3.Row | None:
+        """以大小寫不敏感方式查詢玩家名稱，回傳 (steam_id, player_name) 列。"""
+        with self._reader() as conn:
+            return conn.execute(
+                _SQL_IDENTITY_BY_NAME_NOCASE, (player_name,)
+            ).fetchone()
 
     def get_player_name_by_steam_id(self, steam_id: str) -> str | None:
         """根據 SteamID 查詢玩家名稱。"""
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                row = conn.execute(
-                    "SELECT player_name FROM player_identity WHERE steam_id = ?",
-                    (steam_id,),
-                ).fetchone()
-                return row["player_name"] if row else None
-            finally:
-                conn.close()
-
-    def get_all_player_identities(self) -> list[dict]:
-        with self._lock:
-            conn = self._get_conn()
-            try:
-                rows = conn.execute(
-                    "SELECT * FROM player_identity ORDER BY updated_at DESC"
-                ).fetchall()
-                return [dict(r) for r in rows]
-            finally:
-                conn.close()
+        with self._reader() as conn:
+            row = conn.execute(_SQL_NAME_BY_STEAM_ID, (steam_id,)).fetchone()
+            return row["player_name"] if row else None
+
+    def get_eos_id_by_steam_id(self, steam_id: str) -> str | None:
+        """根據 SteamID 查詢 EOS ID。"""
+        with self._reader() as conn:
+            row = conn.execute(_SQL_EOS_ID_BY_STEAM_ID, (steam_id,)).fetchone()
+            return row["eos_id"] if row else None
+
+    def get_all_player_identities(self) -> list[sqlite3.Row]:
+        with self._reader() as conn:
+            return conn.execute(_SQL_ALL_IDENTITIES).fetchall()
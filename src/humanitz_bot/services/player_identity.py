@@ -7,14 +7,48 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from humanitz_bot.services.database import Database
 
 logger = logging.getLogger("humanitz_bot.services.player_identity")
 
+# 玩家必須先 Connected 才會出現 Disconnected，且兩者名稱相同；只需解析 Connected 行
+_CONNECT_LINE_PREFIX = b"Player Connected "
+_HEX_DIGITS = b"0123456789abcdefABCDEF"
+
+# 在線名單未變時最多連續略過幾次 DB 寫入；之後仍重寫一次以更新 updated_at（最後在線時間）
+_IDENTITY_REFRESH_POLLS = 10
+
+
+def _parse_connect_line(line: bytes) -> tuple[str, str, str] | None:
+    """以 partition 解析一行連線記錄（不使用 regex），回傳 (steam_id, name, eos_id)。
+
+    格式: Player Connected <name> NetID(<steam64>_+_|<eosid>) (<date>)
+    呼叫端須先確認行首為 _CONNECT_LINE_PREFIX。
+    """
+    head, sep, rest = line.partition(b" NetID(")
+    if not sep:
+        return None
+    name = head[len(_CONNECT_LINE_PREFIX) :]
+    ids, sep, _ = rest.partition(b")")
+    if not name or not sep:
+        return None
+    steam_id, sep, eos_id = ids.partition(b"_+_|")
+    if not sep or not steam_id.isdigit() or not eos_id:
+        return None
+    if eos_id.translate(None, _HEX_DIGITS):
+        return None
+    return (
+        steam_id.decode("ascii"),
+        name.decode("utf-8", errors="replace"),
+        eos_id.decode("ascii"),
+    )
+
 
 @dataclass
 class PlayerIdentityInfo:
@@ -23,6 +57,11 @@ class PlayerIdentityInfo:
     steam_id: str
     player_name: str
     eos_id: str = ""
+    # 小寫名稱（快取 key），建立時計算一次
+    name_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.name_lower = self.player_name.lower()
 
 
 class PlayerIdentityService:
@@ -34,51 +73,81 @@ class PlayerIdentityService:
 
     def __init__(self, db: Database) -> None:
         self._db = db
-        # 記憶體快取：name → steam_id（小寫 name 作為 key）
-        self._name_to_steam: dict[str, str] = {}
-        # 記憶體快取：steam_id → name
-        self._steam_to_name: dict[str, str] = {}
+        # 記憶體快取：steam_id → (name, name_lower)，唯一的權威結構
+        self._by_steam: dict[str, tuple[str, str]] = {}
+        # 反向索引 name_lower → steam_id，寫入後設為 None，查詢時才重建
+        self._by_name_lower: dict[str, str] | None = None
+        # 保護快取寫入與反向索引重建（get_steam_id_fast 會在 event loop 呼叫）
+        self._cache_lock = threading.Lock()
+        # 上次 update_players 成功寫入的資料列，相同時略過 DB 寫入
+        self._last_rows: tuple[tuple[str, str, str], ...] = ()
+        self._skipped_updates = 0
         self._load_from_db()
 
     def _load_from_db(self) -> None:
         """從 SQLite 載入已知的玩家身份到記憶體快取。"""
         try:
             identities = self._db.get_all_player_identities()
-            for row in identities:
-                name = row["player_name"]
-                steam_id = row["steam_id"]
-                self._name_to_steam[name.lower()] = steam_id
-                self._steam_to_name[steam_id] = name
+            with self._cache_lock:
+                for row in identities:
+                    self._set_cached(row["steam_id"], row["player_name"])
             logger.info("Loaded %d player identities from database", len(identities))
         except Exception:
             logger.exception("Failed to load player identities from database")
 
+    def _set_cached(
+        self, steam_id: str, name: str, name_lower: str | None = None
+    ) -> None:
+        """寫入單筆快取（呼叫端須持有 _cache_lock）。內容未變時不使反向索引失效。"""
+        entry = (name, name.lower() if name_lower is None else name_lower)
+        if self._by_steam.get(steam_id) == entry:
+            return
+        # 移到尾端：重建反向索引時，同名玩家以最近寫入者為準
+        self._by_steam.pop(steam_id, None)
+        self._by_steam[steam_id] = entry
+        self._by_name_lower = None
+
+    def _name_index(self) -> dict[str, str]:
+        """取得 name_lower → steam_id 反向索引，必要時重建。"""
+        index = self._by_name_lower
+        if index is None:
+            with self._cache_lock:
+                index = self._by_name_lower
+                if index is None:
+                    index = {
+                        name_lower: steam_id
+                        for steam_id, (_, name_lower) in self._by_steam.items()
+                    }
+                    self._by_name_lower = index
+        return index
+
     def update_players(self, players: list[PlayerIdentityInfo]) -> None:
         """批次更新玩家身份（來自 RCON Players 指令結果）。
 
         Args:
             players: 從 RconService.fetch_all() 解析出的玩家列表
         """
-        for p in players:
-            if not p.steam_id or not p.player_name:
-                continue
-
-            # 更新記憶體快取（先清除舊名稱的映射）
-            old_name = self._steam_to_name.get(p.steam_id)
-            if old_name and old_name != p.player_name:
-                self._name_to_steam.pop(old_name.lower(), None)
-            self._steam_to_name[p.steam_id] = p.player_name
-            self._name_to_steam[p.player_name.lower()] = p.steam_id
-
-            # 持久化到 SQLite
+        rows: list[tuple[str, str, str]] = []
+        with self._cache_lock:
+            for p in players:
+                if not p.steam_id or not p.player_name:
+                    continue
+                self._set_cached(p.steam_id, p.player_name, p.name_lower)
+                rows.append((p.steam_id, p.player_name, p.eos_id))
+
+        # 持久化到 SQLite（單一交易）；在線名單與上次相同時略過，
+        # 但每 _IDENTITY_REFRESH_POLLS 次仍重寫，讓 updated_at 維持「最後在線」的語意
+        snapshot = tuple(rows)
+        if snapshot == self._last_rows and self._skipped_updates < _IDENTITY_REFRESH_POLLS:
+            self._skipped_updates += 1
+        elif rows:
             try:
-                self._db.upsert_player_identity(
-                    steam_id=p.steam_id,
-                    player_name=p.player_name,
-                    eos_id=p.eos_id,
-                )
+                self._db.upsert_player_identities_bulk(rows)
+                self._last_rows = snapshot
+                self._skipped_updates = 0
             except Exception:
-                logger.exception("Failed to upsert player identity: %s", p.player_name)
+                self._last_rows = ()
+                logger.exception("Failed to upsert %d player identities", len(rows))
 
         if players:
             logger.debug("Updated %d player identities", len(players))
@@ -93,31 +162,35 @@ class PlayerIdentityService:
             SteamID 字串，或 None（找不到時）
         """
         # 先查記憶體快取
-        steam_id = self._name_to_steam.get(player_name.lower())
+        steam_id = self.get_steam_id_fast(player_name.lower())
         if steam_id is not None:
             return steam_id
 
         # 再查 SQLite（大小寫不敏感，與快取行為一致）
         try:
-            with self._db._lock:
-                conn = self._db._get_conn()
-                try:
-                    row = conn.execute(
-                        "SELECT steam_id, player_name FROM player_identity"
-                        " WHERE player_name = ? COLLATE NOCASE",
-                        (player_name,),
-                    ).fetchone()
-                finally:
-                    conn.close()
+            row = self._db.get_steam_id_by_name_nocase(player_name)
             if row is not None:
                 # 同步更新記憶體快取
-                self._name_to_steam[row["player_name"].lower()] = row["steam_id"]
-                self._steam_to_name[row["steam_id"]] = row["player_name"]
+                with self._cache_lock:
+                    self._set_cached(row["steam_id"], row["player_name"])
                 return row["steam_id"]
         except Exception:
             logger.exception("Failed to query player identity: %s", player_name)
         return None
 
+    def get_steam_id_fast(self, name_lower: str) -> str | None:
+        """只查記憶體快取的 SteamID 查詢（不查 SQLite）。
+
+        不做 I/O，可直接在 event loop 中呼叫；未命中時再改用 get_steam_id。
+
+        Args:
+            name_lower: 已轉為小寫的玩家名稱
+
+        Returns:
+            SteamID 字串，或 None（快取中找不到時）
+        """
+        return self._name_index().get(name_lower)
+
     def get_player_name(self, steam_id: str) -> str | None:
         """根據 SteamID 取得玩家名稱。
 
@@ -128,17 +201,17 @@ class PlayerIdentityService:
             玩家名稱字串，或 None（找不到時）
         """
         # 先查記憶體快取
-        name = self._steam_to_name.get(steam_id)
-        if name is not None:
-            return name
+        entry = self._by_steam.get(steam_id)
+        if entry is not None:
+            return entry[0]
 
         # 再查 SQLite（可能是其他程序寫入的）
         try:
             result = self._db.get_player_name_by_steam_id(steam_id)
             if result is not None:
                 # 同步更新記憶體快取
-                self._steam_to_name[steam_id] = result
-                self._name_to_steam[result.lower()] = steam_id
+                with self._cache_lock:
+                    self._set_cached(steam_id, result)
                 return result
         except Exception:
             logger.exception("Failed to query player identity by steam_id: %s", steam_id)
@@ -168,12 +241,13 @@ class PlayerIdentityService:
 
         query_lower = query.lower()
         query_norm = self._normalize_ws(query_lower)
+        name_index = self._name_index()
 
         # 1. 玩家名稱精確匹配（大小寫不敏感，空白正規化）
         exact: list[PlayerIdentityInfo] = []
-        for name_lower, steam_id in self._name_to_steam.items():
+        for name_lower, steam_id in name_index.items():
             if name_lower == query_lower or self._normalize_ws(name_lower) == query_norm:
-                name = self._steam_to_name.get(steam_id, name_lower)
+                name = self._by_steam.get(steam_id, (name_lower,))[0]
                 exact.append(PlayerIdentityInfo(
                     steam_id=steam_id, player_name=name,
                     eos_id=self._get_eos_id(steam_id),
@@ -182,19 +256,19 @@ class PlayerIdentityService:
             return exact
 
         # 2. Steam ID 精確匹配
-        if query in self._steam_to_name:
-            name = self._steam_to_name[query]
+        entry = self._by_steam.get(query)
+        if entry is not None:
             return [PlayerIdentityInfo(
-                steam_id=query, player_name=name,
+                steam_id=query, player_name=entry[0],
                 eos_id=self._get_eos_id(query),
             )]
 
         # 3. 玩家名稱前綴匹配
         prefix: list[PlayerIdentityInfo] = []
-        for name_lower, steam_id in self._name_to_steam.items():
+        for name_lower, steam_id in name_index.items():
             name_norm = self._normalize_ws(name_lower)
             if name_lower.startswith(query_lower) or name_norm.startswith(query_norm):
-                name = self._steam_to_name.get(steam_id, name_lower)
+                name = self._by_steam.get(steam_id, (name_lower,))[0]
                 prefix.append(PlayerIdentityInfo(
                     steam_id=steam_id, player_name=name,
                     eos_id=self._get_eos_id(steam_id),
@@ -204,10 +278,10 @@ class PlayerIdentityService:
 
         # 4. 玩家名稱子字串匹配
         substring: list[PlayerIdentityInfo] = []
-        for name_lower, steam_id in self._name_to_steam.items():
+        for name_lower, steam_id in name_index.items():
             name_norm = self._normalize_ws(name_lower)
             if query_lower in name_lower or query_norm in name_norm:
-                name = self._steam_to_name.get(steam_id, name_lower)
+                name = self._by_steam.get(steam_id, (name_lower,))[0]
                 substring.append(PlayerIdentityInfo(
                     steam_id=steam_id, player_name=name,
                     eos_id=self._get_eos_id(steam_id),
@@ -217,7 +291,7 @@ class PlayerIdentityService:
 
         # 5. Steam ID 前綴匹配
         steam_prefix: list[PlayerIdentityInfo] = []
-        for steam_id, name in self._steam_to_name.items():
+        for steam_id, (name, _) in list(self._by_steam.items()):
             if steam_id.startswith(query):
                 steam_prefix.append(PlayerIdentityInfo(
                     steam_id=steam_id, player_name=name,
@@ -228,31 +302,22 @@ class PlayerIdentityService:
     def _get_eos_id(self, steam_id: str) -> str:
         """從 SQLite 取得 eos_id（快取中未儲存）。"""
         try:
-            with self._db._lock:
-                conn = self._db._get_conn()
-                try:
-                    row = conn.execute(
-                        "SELECT eos_id FROM player_identity WHERE steam_id = ?",
-                        (steam_id,),
-                    ).fetchone()
-                finally:
-                    conn.close()
-            if row is not None:
-                return row["eos_id"] or ""
+            return self._db.get_eos_id_by_steam_id(steam_id) or ""
         except Exception:
-            pass
+            logger.debug("Failed to query eos_id: %s", steam_id, exc_info=True)
         return ""
 
     @property
     def known_count(self) -> int:
         """已知的玩家身份數量。"""
-        return len(self._steam_to_name)
+        return len(self._by_steam)
 
     def import_from_connected_log(self, log_path: str) -> int:
         """從連線日誌匯入歷史玩家身份對應（支援單一檔案或多檔目錄）。
 
-        解析每一行 Connected/Disconnected 記錄，擷取 name↔SteamID↔EosID 並寫入
-        記憶體快取與 SQLite。相同 SteamID 會取最新的名稱（檔案順序由舊到新）。
+        解析每一行 Connected 記錄，擷取 name↔SteamID↔EosID 並寫入
+        記憶體快取與 SQLite。由最新檔案的檔尾往前反向掃描，相同 SteamID
+        只保留第一次遇到（即最新）的名稱，不必反覆覆寫舊記錄。
 
         Args:
             log_path: 單一日誌檔路徑或包含 *_ConnectLog.txt 的目錄路徑
@@ -260,36 +325,32 @@ class PlayerIdentityService:
         Returns:
             匯入的不重複玩家數量
         """
-        from humanitz_bot.services.player_tracker import resolve_connect_logs
+        from humanitz_bot.services.player_tracker import (
+            iter_lines_reversed,
+            resolve_connect_logs,
+        )
 
         log_files = resolve_connect_logs(log_path)
         if not log_files:
             logger.warning("No connection logs found: %s", log_path)
             return 0
 
-        # 匹配: Player Connected/Disconnected <name> NetID(<steam64>_+_|<eosid>) (<date>)
-        pattern = re.compile(
-            r"^Player (?:Connected|Disconnected) (.+?) "
-            r"NetID\((\d+)_\+_\|([a-fA-F0-9]+)\)"
-        )
-
-        # 收集所有 steam_id → (name, eos_id)，從舊到新疊代，後面的檔案會覆蓋前面的（取最新名稱）
+        # 收集所有 steam_id → (name, eos_id)，從新到舊反向疊代，先遇到的即為最新名稱
         identities: dict[str, tuple[str, str]] = {}
 
-        for log_file in log_files:
+        for log_file in reversed(log_files):
             try:
-                with open(log_file, encoding="utf-8", errors="replace") as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
+                with open(log_file, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    for raw_line in iter_lines_reversed(f, size):
+                        raw_line = raw_line.strip()
+                        # 先以前綴過濾，只解析候選行
+                        if not raw_line.startswith(_CONNECT_LINE_PREFIX):
                             continue
-                        m = pattern.match(line)
-                        if not m:
+                        parsed = _parse_connect_line(raw_line)
+                        if parsed is None or parsed[0] in identities:
                             continue
-                        name = m.group(1)
-                        steam_id = m.group(2)
-                        eos_id = m.group(3)
-                        identities[steam_id] = (name, eos_id)
+                        identities[parsed[0]] = parsed[1:]
             except OSError as e:
                 logger.error("Failed to read connection log %s: %s", log_file, e)
 
@@ -297,26 +358,21 @@ class PlayerIdentityService:
             logger.info("No player identities found in connection logs")
             return 0
 
-        # 批次寫入快取與 DB
-        imported = 0
-        for steam_id, (name, eos_id) in identities.items():
-            # 更新記憶體快取（先清除舊名稱的映射）
-            old_name = self._steam_to_name.get(steam_id)
-            if old_name and old_name != name:
-                self._name_to_steam.pop(old_name.lower(), None)
-            self._steam_to_name[steam_id] = name
-            self._name_to_steam[name.lower()] = steam_id
-
-            # 持久化到 SQLite
-            try:
-                self._db.upsert_player_identity(
-                    steam_id=steam_id,
-                    player_name=name,
-                    eos_id=eos_id,
-                )
-                imported += 1
-            except Exception:
-                logger.exception("Failed to import identity: %s (%s)", name, steam_id)
+        # 更新記憶體快取（由舊到新套用，名稱衝突時以最近出現的玩家為準）
+        with self._cache_lock:
+            for steam_id, (name, _eos_id) in reversed(identities.items()):
+                self._set_cached(steam_id, name)
+
+        # 持久化到 SQLite（單一交易）；匯入可能覆蓋在線玩家資料，下次輪詢需重寫
+        self._last_rows = ()
+        try:
+            imported = self._db.upsert_player_identities_bulk(
+                (steam_id, name, eos_id)
+                for steam_id, (name, eos_id) in identities.items()
+            )
+        except Exception:
+            logger.exception("Failed to import %d identities from connection logs", len(identities))
+            imported = 0
 
         logger.info(
             "Imported %d player identities from connection logs (%d total known)",
@@ -350,21 +406,13 @@ class PlayerIdentityService:
                     line = line.strip()
                     if not line:
                         continue
-                    # 格式: <steam64>_+_|<eosid>@<name>
-                    at_idx = line.find("@")
-                    if at_idx == -1:
-                        continue
-                    id_part = line[:at_idx]
-                    name = line[at_idx + 1:]
-                    if not name:
+                    # 格式: <steam64>_+_|<eosid>@<name>（名稱本身可能含 @，以第一個 @ 分割）
+                    id_part, at, name = line.partition("@")
+                    if not at or not name:
                         continue
                     # id_part: <steam64>_+_|<eosid>
-                    sep = id_part.find("_+_|")
-                    if sep == -1:
-                        continue
-                    steam_id = id_part[:sep]
-                    eos_id = id_part[sep + 4:]
-                    if not steam_id.isdigit():
+                    steam_id, sep, eos_id = id_part.partition("_+_|")
+                    if not sep or not steam_id.isdigit():
                         continue
                     identities.append((steam_id, eos_id, name))
         except OSError as e:
@@ -375,23 +423,18 @@ class PlayerIdentityService:
             logger.info("No player identities found in mapped file")
             return 0
 
-        imported = 0
-        for steam_id, eos_id, name in identities:
-            old_name = self._steam_to_name.get(steam_id)
-            if old_name and old_name != name:
-                self._name_to_steam.pop(old_name.lower(), None)
-            self._steam_to_name[steam_id] = name
-            self._name_to_steam[name.lower()] = steam_id
+        with self._cache_lock:
+            for steam_id, _eos_id, name in identities:
+                self._set_cached(steam_id, name)
 
-            try:
-                self._db.upsert_player_identity(
-                    steam_id=steam_id,
-                    player_name=name,
-                    eos_id=eos_id,
-                )
-                imported += 1
-            except Exception:
-                logger.exception("Failed to import identity: %s (%s)", name, steam_id)
+        self._last_rows = ()
+        try:
+            imported = self._db.upsert_player_identities_bulk(
+                (steam_id, name, eos_id) for steam_id, eos_id, name in identities
+            )
+        except Exception:
+            logger.exception("Failed to import %d identities from PlayerIDMapped.txt", len(identities))
+            imported = 0
 
         logger.info(
             "Imported %d player identities from PlayerIDMapped.txt (%d total known)",
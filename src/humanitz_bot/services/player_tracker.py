@@ -3,21 +3,29 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
+from typing import BinaryIO, Iterator
 
+from humanitz_bot.utils.formatters import format_hours_minutes
 from humanitz_bot.utils.i18n import t
 
 logger = logging.getLogger("humanitz_bot.services.player_tracker")
 
 # 匹配格式: Player Connected NAME NetID(STEAMID_+_|EOSID) (DD/MM/Y,YYY HH:MM)
 # 年份千位分隔符因系統語系不同可能是逗號(2,026)或空格(2 026)
+# 直接比對原始 bytes 行：前綴檢查併入 regex（match 錨定行首），行尾 \r 與空白由 \s*$ 吸收
 _CONNECTED_RE = re.compile(
-    r"^Player Connected (.+?) NetID\(.+?\) \((\d+/\d+/[\d, ]+)\s+(\d+:\d+)\)$"
+    rb"Player Connected (.+?) NetID\(.+?\) \((\d+/\d+/[\d, ]+)\s+(\d+:\d+)\)\s*$"
 )
 
 _TAIL_LINES = 200
+# 從檔尾反向讀取的區塊大小
+_TAIL_CHUNK = 65536
 
 
 def resolve_connect_logs(path_str: str) -> list[Path]:
@@ -65,11 +73,23 @@ def resolve_connect_logs(path_str: str) -> list[Path]:
     return []
 
 
+@dataclass
+class _LogState:
+    """單一連線日誌檔的增量解析狀態。"""
+
+    ino: int
+    # 已解析到的位元組位置（最後一個完整行的結尾）
+    offset: int = 0
+    # 玩家名稱(bytes) → 該檔案中最近一次 Connected 時間
+    last_connect: dict[bytes, datetime] = field(default_factory=dict)
+
+
 class PlayerTracker:
     """解析連線日誌（支援單一檔案或 HZLogs/Login/ 目錄），取得指定玩家的最近連線時間。"""
 
     def __init__(self, log_path: str) -> None:
         self._log_path_str = log_path
+        self._log_states: dict[Path, _LogState] = {}
 
     def get_online_times(self, online_names: list[str]) -> dict[str, datetime]:
         """取得指定在線玩家的最近 Connected 時間。
@@ -92,7 +112,12 @@ class PlayerTracker:
             logger.warning(t("log.player_log_not_found"), self._log_path_str)
             return {}
 
-        remaining = set(online_names)
+        # 移除已不存在於日誌列表中的檔案狀態
+        for stale in self._log_states.keys() - set(log_files):
+            del self._log_states[stale]
+
+        # 以 bytes 比對名稱，避免逐行 decode；命中後再對應回原本的 str 名稱
+        remaining = {name.encode("utf-8"): name for name in online_names}
         result: dict[str, datetime] = {}
 
         # 從最新到最舊搜尋
@@ -101,56 +126,104 @@ class PlayerTracker:
                 break
 
             try:
-                tail_lines = self._read_tail(log_file)
+                last_connect = self._scan(log_file)
             except OSError as e:
                 logger.error(t("log.player_log_read_error"), e)
                 continue
 
-            for line in reversed(tail_lines):
-                if not remaining:
-                    break
-
-                line = line.strip()
-                if not line.startswith("Player Connected "):
-                    continue
+            for name_bytes in [n for n in remaining if n in last_connect]:
+                result[remaining.pop(name_bytes)] = last_connect[name_bytes]
 
-                m = _CONNECTED_RE.match(line)
-                if not m:
-                    continue
+        if remaining:
+            logger.debug(t("log.player_not_found_in_log"), set(remaining.values()))
 
-                name = m.group(1)
-                if name not in remaining:
-                    continue
+        return result
 
-                # 解析日期 — 年份千位分隔符: 2,026 或 2 026 → 2026
-                date_str = re.sub(r"[, ]", "", m.group(2))
-                time_str = m.group(3)
+    def _scan(self, path: Path) -> dict[bytes, datetime]:
+        """增量更新並回傳單一日誌檔的「玩家 → 最近 Connected 時間」。
 
-                try:
-                    dt = datetime.strptime(f"{date_str} {time_str}", "%d/%m/%Y %H:%M")
-                except ValueError:
-                    logger.warning(t("log.player_time_parse_error"), date_str, time_str)
-                    continue
+        首次讀取或檔案輪替（inode 改變、檔案變小）時解析尾端約 200 行；
+        之後只從上次的 offset 往後讀取新追加的內容。
+        """
+        st = os.stat(path)
+        state = self._log_states.get(path)
+        rotated = (
+            state is None or state.ino != st.st_ino or st.st_size < state.offset
+        )
+        if not rotated and st.st_size == state.offset:
+            return state.last_connect
+
+        with open(path, "rb") as f:
+            if rotated:
+                state = _LogState(ino=st.st_ino)
+                self._log_states[path] = state
+                lines = _read_tail(f, st.st_size)
+            else:
+                f.seek(state.offset)
+                lines = f.read(st.st_size - state.offset).split(b"\n")
+
+        # 最後一段沒有換行的片段可能尚未寫完，下次從它的開頭重新讀取
+        state.offset = st.st_size - len(lines[-1])
+
+        for line in lines:
+            if not line.startswith(b"P"):
+                continue
+            m = _CONNECTED_RE.match(line)
+            if not m:
+                continue
+            dt = _parse_connected_time(m)
+            if dt is not None:
+                state.last_connect[m.group(1)] = dt
 
-                result[name] = dt
-                remaining.discard(name)
+        return state.last_connect
 
-        if remaining:
-            logger.debug(t("log.player_not_found_in_log"), remaining)
 
-        return result
+def iter_lines_reversed(f: BinaryIO, size: int) -> Iterator[bytes]:
+    """從 size 位置往檔頭以 64 KiB 區塊反向讀取，逐行產生原始 bytes（最新行優先）。
 
-    @staticmethod
-    def _read_tail(path: Path) -> list[str]:
-        """讀取檔案尾端約 200 行。"""
-        with open(path, encoding="utf-8", errors="replace") as f:
-            # seek 到檔案末尾附近，避免 O(n) 全檔掃描
-            f.seek(0, 2)
-            size = f.tell()
-            f.seek(max(0, size - 65536))  # 回退 64KB，足夠涵蓋 200+ 行
-            if f.tell() > 0:
-                f.readline()  # 跳過可能不完整的首行
-            return f.readlines()[-_TAIL_LINES:]
+    第一個產生的項目為最後一個換行之後的片段（檔案以換行結尾時為空）。
+    """
+    pos = size
+    rest = b""
+    while pos > 0:
+        step = min(_TAIL_CHUNK, pos)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + rest).split(b"\n")
+        # 首段可能是被區塊切斷的行，留待與前一個區塊合併
+        rest = lines[0]
+        yield from reversed(lines[1:])
+    yield rest
+
+
+def _read_tail(f: BinaryIO, size: int) -> list[bytes]:
+    """回傳最後約 200 行的原始 bytes（不 decode）。
+
+    回傳列表的最後一項為最後一個換行之後的片段（檔案以換行結尾時為空）。
+    """
+    lines = list(islice(iter_lines_reversed(f, size), _TAIL_LINES + 1))
+    lines.reverse()
+    return lines
+
+
+def _parse_connected_time(m: re.Match[bytes]) -> datetime | None:
+    """將 _CONNECTED_RE 的日期/時間群組轉為 datetime，格式錯誤時回傳 None。"""
+    # 解析日期 — 年份千位分隔符: 2,026 或 2 026 → 2026
+    # regex 已保證 D/M/Y 與 H:M 形狀，直接拆分轉 int，不走 strptime
+    date_bytes = m.group(2).translate(None, b", ")
+    time_bytes = m.group(3)
+    day, month, year = date_bytes.split(b"/")
+    hour, minute = time_bytes.split(b":")
+
+    try:
+        return datetime(int(year), int(month), int(day), int(hour), int(minute))
+    except ValueError:
+        logger.warning(
+            t("log.player_time_parse_error"),
+            date_bytes.decode("ascii"),
+            time_bytes.decode("ascii"),
+        )
+        return None
 
 
 def format_duration(td: timedelta) -> str:
@@ -164,12 +237,4 @@ def format_duration(td: timedelta) -> str:
         >>> format_duration(timedelta(minutes=2))
         '2m'
     """
-    total_minutes = int(td.total_seconds()) // 60
-    if total_minutes < 0:
-        total_minutes = 0
-
-    hours, minutes = divmod(total_minutes, 60)
-
-    if hours > 0:
-        return f"{hours}h{minutes}m"
-    return f"{minutes}m"
+    return format_hours_minutes(int(td.total_seconds()) // 60)
@@ -47,8 +47,23 @@ class FetchAllResult:
 
 # regex: 玩家名 (Steam64ID_+_|EOS_ID) — 後方可能有 Lv/Clan/DPassed（2026-03-01 更新新增）
 _PLAYER_RE = re.compile(r"^(.+?) \((\d+)_\+_\|([a-f0-9]+)\)")
+# info 回應（Players: 之前的部分）一次 finditer 解析；以 lastgroup 判斷命中哪個欄位
+# 遊戲更新 2026-03-01 起，Name 後方新增 (Uptime: X minutes)
 # AI: Zombies=135  Human=5 Animal=16
-_AI_RE = re.compile(r"Zombies=(\d+)\s+Human=(\d+)\s+Animal=(\d+)")
+_INFO_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"Name: (?=[ \t]*\S)(?P<name>.*?)(?:[ \t]*\(Uptime:.*\))?[ \t\r]*$"
+    r"|Season: (?P<season>[^\r\n]*\S)"
+    r"|Weather: (?P<weather>[^\r\n]*\S)"
+    r"|Time: (?P<time>[^\r\n]*\S)"
+    r"|FPS: (?P<fps>\d+)[ \t\r]*$"
+    r"|(?P<count>\d+)[ \t]+connected\."
+    r"|AI:[^\r\n]*?Zombies=(?P<zombies>\d+)[ \t]+Human=(?P<humans>\d+)"
+    r"[ \t]+Animal=(?P<animals>\d+)"
+    r")",
+    re.M,
+)
+_INFO_PLAYERS_RE = re.compile(r"^[ \t]*Players:[ \t\r]*$", re.M)
 
 
 class RconService:
@@ -134,7 +149,7 @@ class RconService:
         """批次執行 info + Players，回傳結構化資料。
 
         fetchchat 由 ChatBridgeCog 的獨立 RCON 連線負責，不在此執行。
-        在同一個 lock 內依序執行兩個指令，避免連線衝突。
+        在同一個 lock 內以單次 to_thread 依序執行兩個指令，避免連線衝突。
         """
         async with self._lock:
             if not await self._ensure_connected():
@@ -148,14 +163,10 @@ class RconService:
 
             result = FetchAllResult(online=True)
             try:
-                info_raw, _ = await asyncio.to_thread(
-                    self._client.execute_simple, "info", 3.5
+                info_raw, players_raw = await asyncio.to_thread(
+                    self._client.execute_many_simple, ["info", "Players"], 3.5
                 )
                 result.server_info = self._parse_info(info_raw)
-
-                players_raw, _ = await asyncio.to_thread(
-                    self._client.execute_simple, "Players", 3.5
-                )
                 result.players = self._parse_players(players_raw)
 
             except (RconConnectionError, OSError) as e:
@@ -184,46 +195,34 @@ class RconService:
             kevin052926
         """
         info = ServerInfo(raw=raw)
-        lines = raw.replace("\r\n", "\n").split("\n")
-
-        in_players_section = False
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-
-            if in_players_section:
-                info.player_names.append(stripped)
-                continue
 
-            if stripped.startswith("Name: "):
-                raw_name = stripped[6:]
-                # 遊戲更新 2026-03-01 起，名稱後方新增 (Uptime: X minutes)
-                uptime_m = re.search(r"\s*\(Uptime:.*\)$", raw_name)
-                info.name = raw_name[:uptime_m.start()] if uptime_m else raw_name
-            elif stripped == "Players:":
-                in_players_section = True
-            elif stripped.startswith("Season: "):
-                info.season = stripped[8:]
-            elif stripped.startswith("Weather: "):
-                info.weather = stripped[9:]
-            elif stripped.startswith("Time: "):
-                info.game_time = stripped[6:]
-            elif stripped.startswith("FPS: "):
-                try:
-                    info.fps = int(stripped[5:])
-                except ValueError:
-                    pass
-            elif "connected." in stripped:
-                m = re.match(r"(\d+)\s+connected\.", stripped)
-                if m:
-                    info.player_count = int(m.group(1))
-            elif stripped.startswith("AI:"):
-                m = _AI_RE.search(stripped)
-                if m:
-                    info.zombies = int(m.group(1))
-                    info.humans = int(m.group(2))
-                    info.animals = int(m.group(3))
+        players_m = _INFO_PLAYERS_RE.search(raw)
+        head = raw[: players_m.start()] if players_m else raw
+        if players_m:
+            info.player_names = [
+                name
+                for line in raw[players_m.end() :].split("\n")
+                if (name := line.strip())
+            ]
+
+        for m in _INFO_RE.finditer(head):
+            kind = m.lastgroup
+            if kind == "name":
+                info.name = m["name"]
+            elif kind == "season":
+                info.season = m["season"]
+            elif kind == "weather":
+                info.weather = m["weather"]
+            elif kind == "time":
+                info.game_time = m["time"]
+            elif kind == "fps":
+                info.fps = int(m["fps"])
+            elif kind == "count":
+                info.player_count = int(m["count"])
+            elif kind == "animals":
+                info.zombies = int(m["zombies"])
+                info.humans = int(m["humans"])
+                info.animals = int(m["animals"])
 
         return info
 
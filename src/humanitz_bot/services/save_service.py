@@ -10,18 +10,25 @@ import asyncio
 import json
 import logging
 import shutil
+import sqlite3
 import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterator, TextIO, TypeVar
 
+from humanitz_bot.save_extractor import PLAYERS_OPEN
 from humanitz_bot.services.database import Database
 
 logger = logging.getLogger("humanitz_bot.services.save_service")
 
 _UESAVE_BIN = "uesave"
 
+# save_extractor 子程序固定參數（輸入/輸出路徑於 __init__ 附加）
+_EXTRACTOR_ARGV = (sys.executable, "-m", "humanitz_bot.save_extractor")
+
 # LGSM 標準存檔相對路徑（從 serverfiles 往下）
 _SAVE_RELATIVE = "HumanitZServer/Saved/SaveGames/SaveList/Default/Save_DedicatedSaveMP.sav"
 
@@ -29,8 +36,44 @@ _SAVE_RELATIVE = "HumanitZServer/Saved/SaveGames/SaveList/Default/Save_Dedicated
 _LGSM_GLOB = "/home/*/serverfiles/" + _SAVE_RELATIVE
 
 
+def _read_extract(f: TextIO) -> tuple[dict, Iterator[dict]]:
+    """讀取 save_extractor 輸出，回傳 (表頭 dict, 玩家 dict iterator)。
+
+    新格式逐行串流解析玩家，記憶體中同時只有一位玩家的資料；
+    舊版單行格式則退回整檔 json.load。
+    """
+    first = f.readline().rstrip("\n")
+    if not first.endswith(PLAYERS_OPEN):
+        data = json.loads(first + f.read())
+        return data, iter(data.get("players", []))
+
+    header = json.loads(first[: -len(PLAYERS_OPEN)] + "}")
+
+    def players() -> Iterator[dict]:
+        for line in f:
+            line = line.rstrip(",\n")
+            if line == "]}":
+                return
+            if not line:
+                continue
+            # 單行損毀只略過該玩家，不中斷整個匯入
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Malformed player line in extract JSON: skipping", exc_info=True)
+
+    return header, players()
+
+
+def _is_valid_player_row(row: tuple) -> bool:
+    """檢查 save_players 寫入列：steam_id 必須為非空字串，其餘欄位只能是 SQLite 可綁定的純量。"""
+    steam_id = row[0]
+    if not isinstance(steam_id, str) or not steam_id:
+        return False
+    return all(v is None or isinstance(v, (str, int, float)) for v in row)
 
-@dataclass
+
+@dataclass(slots=True)
 class SavePlayerData:
     """從存檔提取的玩家摘要資料"""
 
@@ -58,11 +101,71 @@ class SavePlayerData:
     takedown_kills: int = 0
     fish_caught: int = 0
     times_bitten: int = 0
-    challenges: dict[str, float] | None = None
+    # challenges 原始 JSON，透過 challenges 屬性延遲解析
+    challenges_json: str = field(default="{}", repr=False)
+    # 由 PlayerIdentityService 填入
+    player_name: str = ""
+    _challenges: dict[str, float] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def challenges(self) -> dict[str, float]:
+        """挑戰進度（首次存取時才解析 challenges_json，結果保留於實例）。"""
+        if self._challenges is None:
+            try:
+                self._challenges = (
+                    json.loads(self.challenges_json) if self.challenges_json else {}
+                )
+            except (json.JSONDecodeError, TypeError):
+                self._challenges = {}
+        return self._challenges
+
+
+# 可直接由 DB 欄位對應的 SavePlayerData 欄位
+_SAVE_PLAYER_FIELDS = frozenset(f.name for f in fields(SavePlayerData) if f.init)
+
+
+@lru_cache(maxsize=16)
+def _player_column_plan(keys: tuple[str, ...]) -> tuple[tuple[int, str], ...]:
+    """依查詢欄位建立 ((索引, 欄位名), ...) 對應表。
+
+    同一條 SQL 的欄位固定，對應表只計算一次，之後以索引直接取值。
+    """
+    return tuple((i, k) for i, k in enumerate(keys) if k in _SAVE_PLAYER_FIELDS)
+
+
+@dataclass(slots=True)
+class SurvivalRankEntry:
+    """存活天數排行榜的一列（欄位與 Database 排行榜查詢選取的欄位一一對應）"""
+
+    steam_id: str
+    survival_days: int
+    # 由 PlayerIdentityService 填入
+    player_name: str = ""
+
+
+@dataclass(slots=True)
+class KillRankEntry:
+    """擊殺數排行榜的一列（欄位與 Database 排行榜查詢選取的欄位一一對應）"""
+
+    steam_id: str
+    zombies_killed: int
+    headshots: int
+    melee_kills: int
+    gun_kills: int
+    blast_kills: int
+    fist_kills: int
+    vehicle_kills: int
+    takedown_kills: int
     # 由 PlayerIdentityService 填入
     player_name: str = ""
 
-@dataclass
+
+_RankEntryT = TypeVar("_RankEntryT", SurvivalRankEntry, KillRankEntry)
+
+
+@dataclass(slots=True)
 class SaveGameState:
     """遊戲狀態摘要"""
 
@@ -95,18 +198,39 @@ class SaveService:
         self._parsing = False
         self._last_parse_time: float = 0.0
         self._uesave_available: bool = False
+        # limit → 排行榜結果（每種排行榜各一份）；save_players 只在匯入時變動，存檔重新解析時清空
+        self._survival_cache: dict[int, list[SurvivalRankEntry]] = {}
+        self._kill_cache: dict[int, list[KillRankEntry]] = {}
+        self._import_generation = 0
 
         # 解析存檔路徑
         self._save_file_path: Path | None = self._resolve_save_path(save_file_path)
 
-        # 檢查 uesave 是否可用
+        # 檢查 uesave 是否可用（並解析為絕對路徑）
+        self._uesave_bin = _UESAVE_BIN
         self._check_uesave()
 
+        # 子程序 argv 在此一次組好：路徑皆固定，每次解析直接沿用
+        self._uesave_argv: tuple[str, ...] = (
+            self._uesave_bin,
+            "to-json",
+            "--input",
+            str(self._save_file_path),
+            "--output",
+            str(self._save_json_path),
+        )
+        self._extractor_argv: tuple[str, ...] = (
+            *_EXTRACTOR_ARGV,
+            str(self._save_json_path),
+            str(self._extract_json_path),
+        )
+
     def _check_uesave(self) -> None:
         """檢查 uesave CLI 是否已安裝。"""
         uesave_path = shutil.which(_UESAVE_BIN)
         if uesave_path:
             self._uesave_available = True
+            self._uesave_bin = uesave_path
             logger.info("uesave found: %s", uesave_path)
         else:
             self._uesave_available = False
@@ -204,6 +328,9 @@ class SaveService:
 
             # Step 3: 匯入 SQLite
             player_count = await asyncio.to_thread(self._import_to_db)
+            self._survival_cache.clear()
+            self._kill_cache.clear()
+            self._import_generation += 1
 
             elapsed = time.monotonic() - start
 
@@ -229,8 +356,19 @@ class SaveService:
             logger.exception("Save parse failed")
             return False
         finally:
+            # 完整 JSON 與提取結果都只是中間檔，不論成功或失敗都刪除
+            #（若 SAVE_JSON_PATH 指向 tmpfs，可避免殘留檔案佔用 RAM）
+            self._remove_temp_files()
             self._parsing = False
 
+    def _remove_temp_files(self) -> None:
+        """刪除 uesave 輸出與 extractor 輸出的暫存 JSON。"""
+        for path in (self._save_json_path, self._extract_json_path):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("Failed to remove temp file %s: %s", path, e)
+
     async def _run_uesave(self) -> bool:
         """執行 uesave to-json 子程序。"""
         if self._save_file_path is None:
@@ -241,13 +379,9 @@ class SaveService:
 
         try:
             proc = await asyncio.create_subprocess_exec(
-                _UESAVE_BIN,
-                "to-json",
-                "--input",
-                str(self._save_file_path),
-                "--output",
-                str(self._save_json_path),
-                stdout=asyncio.subprocess.PIPE,
+                *self._uesave_argv,
+                # JSON 直接寫入 --output 檔案，stdout 不使用，只需讀取 stderr
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
             try:
@@ -270,8 +404,10 @@ class SaveService:
                     stderr.decode("utf-8", errors="replace")[:500],
                 )
 
-            json_size = self._save_json_path.stat().st_size
-            logger.info("uesave to-json complete: output=%d bytes", json_size)
+            # 檔案大小僅供 log，INFO 未啟用時不必 stat
+            if logger.isEnabledFor(logging.INFO):
+                json_size = self._save_json_path.stat().st_size
+                logger.info("uesave to-json complete: output=%d bytes", json_size)
             return True
 
         except FileNotFoundError:
@@ -288,16 +424,13 @@ class SaveService:
 
         try:
             proc = await asyncio.create_subprocess_exec(
-                sys.executable,
-                "-m",
-                "humanitz_bot.save_extractor",
-                str(self._save_json_path),
-                str(self._extract_json_path),
-                stdout=asyncio.subprocess.PIPE,
+                *self._extractor_argv,
+                # extractor 的 log 與警告都輸出到 stderr，stdout 不使用
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
             try:
-                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
             except asyncio.TimeoutError:
                 proc.kill()
                 await proc.communicate()
@@ -319,11 +452,12 @@ class SaveService:
                     if line.strip():
                         logger.debug("extractor: %s", line.strip())
 
-            logger.info(
-                "Save extraction complete: %s (%d bytes)",
-                self._extract_json_path,
-                self._extract_json_path.stat().st_size,
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Save extraction complete: %s (%d bytes)",
+                    self._extract_json_path,
+                    self._extract_json_path.stat().st_size,
+                )
             return True
 
         except Exception:
@@ -334,81 +468,133 @@ class SaveService:
         """將提取的 JSON 匯入 SQLite（同步，在 to_thread 中執行）。
 
         Returns:
-            成功匯入的玩家數量。
+            實際寫入 DB 的玩家數量。
         """
-        with open(self._extract_json_path, encoding="utf-8") as f:
-            data = json.load(f)
-
-        # 匯入玩家資料
-        players = data.get("players", [])
-        success_count = 0
-        for p in players:
-            try:
-                # 將 challenges dict 序列化為 JSON 字串
-                challenges_raw = p.get("challenges", {})
-                challenges_str = json.dumps(challenges_raw, ensure_ascii=False) if challenges_raw else "{}"
-                self._db.upsert_save_player(
-                    steam_id=p["steam_id"],
-                    x=p.get("x", 0.0),
-                    y=p.get("y", 0.0),
-                    z=p.get("z", 0.0),
-                    health=p.get("health", 0.0),
-                    hunger=p.get("hunger", 0.0),
-                    thirst=p.get("thirst", 0.0),
-                    stamina=p.get("stamina", 0.0),
-                    infection=p.get("infection", 0.0),
-                    bites=p.get("bites", 0),
-                    survival_days=p.get("survival_days", 0),
-                    profession=p.get("profession", ""),
-                    is_male=p.get("is_male", True),
-                    zombies_killed=p.get("zombies_killed", 0),
-                    headshots=p.get("headshots", 0),
-                    melee_kills=p.get("melee_kills", 0),
-                    gun_kills=p.get("gun_kills", 0),
-                    blast_kills=p.get("blast_kills", 0),
-                    fist_kills=p.get("fist_kills", 0),
-                    vehicle_kills=p.get("vehicle_kills", 0),
-                    takedown_kills=p.get("takedown_kills", 0),
-                    fish_caught=p.get("fish_caught", 0),
-                    times_bitten=p.get("times_bitten", 0),
-                    challenges_json=challenges_str,
-                )
-                success_count += 1
-            except Exception:
+        player_count = 0
+
+        def rows(players: Iterator[dict]) -> Iterator[tuple]:
+            nonlocal player_count
+            for p in players:
+                player_count += 1
+                if not isinstance(p, dict):
+                    logger.warning("Unexpected player entry in extract JSON: skipping")
+                    continue
                 steam_id = p.get("steam_id", "unknown")
-                logger.warning("Failed to upsert player %s: skipping", steam_id, exc_info=True)
-                continue
+                try:
+                    row = self._to_save_player_row(p)
+                except Exception:
+                    logger.warning("Failed to convert player %s: skipping", steam_id, exc_info=True)
+                    continue
+                if not _is_valid_player_row(row):
+                    logger.warning("Invalid save row for player %s: skipping", steam_id)
+                    continue
+                yield row
+
+        def import_players(
+            upsert: Callable[[Iterator[tuple]], int],
+        ) -> tuple[dict, int]:
+            nonlocal player_count
+            player_count = 0
+            with open(self._extract_json_path, encoding="utf-8") as f:
+                header, players = _read_extract(f)
+                return header, upsert(rows(players))
+
+        # 匯入玩家資料（逐位串流讀取，整批在單一交易中 executemany）；
+        # 整批失敗（已回滾）時重新讀檔逐筆寫入，只略過寫不進去的玩家
+        try:
+            header, success_count = import_players(self._db.upsert_save_players_many)
+        except sqlite3.Error:
+            logger.warning("Batch import of save players failed, retrying one by one", exc_info=True)
+            header, success_count = import_players(self._db.upsert_save_players_each)
 
         # 匯入遊戲狀態
-        game_state = data.get("game_state", {})
+        game_state = header.get("game_state", {})
         self._db.upsert_save_game_state(
             days_passed=game_state.get("days_passed", 0),
             season_day=game_state.get("season_day", 0),
             random_seed=game_state.get("random_seed", 0),
         )
 
-        logger.debug("Extracted player_count=%d from JSON, imported=%d", len(players), success_count)
-        logger.info("Imported %d/%d players and game state to database", success_count, len(players))
+        logger.debug("Extracted player_count=%d from JSON, imported=%d", player_count, success_count)
+        logger.info("Imported %d/%d players and game state to database", success_count, player_count)
         return success_count
 
+    @staticmethod
+    def _to_save_player_row(p: dict) -> tuple:
+        """將 extract JSON 的玩家 dict 轉為 save_players 寫入列（欄位順序同 Database）。"""
+        # extractor 已序列化為 challenges_json；舊版 extract 仍為 challenges dict
+        challenges_str = p.get("challenges_json")
+        if challenges_str is None:
+            challenges_raw = p.get("challenges", {})
+            challenges_str = json.dumps(challenges_raw, ensure_ascii=False) if challenges_raw else "{}"
+        return (
+            p["steam_id"],
+            p.get("x", 0.0),
+            p.get("y", 0.0),
+            p.get("z", 0.0),
+            p.get("health", 0.0),
+            p.get("hunger", 0.0),
+            p.get("thirst", 0.0),
+            p.get("stamina", 0.0),
+            p.get("infection", 0.0),
+            p.get("bites", 0),
+            p.get("survival_days", 0),
+            p.get("profession", ""),
+            int(p.get("is_male", True)),
+            p.get("zombies_killed", 0),
+            p.get("headshots", 0),
+            p.get("melee_kills", 0),
+            p.get("gun_kills", 0),
+            p.get("blast_kills", 0),
+            p.get("fist_kills", 0),
+            p.get("vehicle_kills", 0),
+            p.get("takedown_kills", 0),
+            p.get("fish_caught", 0),
+            p.get("times_bitten", 0),
+            challenges_str,
+        )
+
     # === 查詢 API ===
 
     async def get_player(self, steam_id: str) -> SavePlayerData | None:
-        """查詢單個玩家的存檔資料。"""
-        row = await asyncio.to_thread(self._db.get_save_player, steam_id)
+        """查詢單個玩家的存檔資料（含 player_identity 中的玩家名稱）。"""
+        row = await asyncio.to_thread(self._db.get_save_player_with_identity, steam_id)
         if row is None:
             return None
-        return self._row_to_player(row)
+        return self._rows_to_players([row])[0]
 
-    async def get_leaderboard(self, limit: int = 10) -> list[SavePlayerData]:
+    async def get_leaderboard(self, limit: int = 10) -> list[SurvivalRankEntry]:
         """取得存活天數排行榜。"""
-        rows = await asyncio.to_thread(self._db.get_save_leaderboard, limit)
-        return [self._row_to_player(r) for r in rows]
+        return await self._cached_leaderboard(
+            self._survival_cache, limit, self._db.get_save_leaderboard, SurvivalRankEntry
+        )
 
-    async def get_kill_leaderboard(self, limit: int = 10) -> list[SavePlayerData]:
+    async def get_kill_leaderboard(self, limit: int = 10) -> list[KillRankEntry]:
         """取得擊殺數排行榜。"""
-        rows = await asyncio.to_thread(self._db.get_kill_leaderboard, limit)
-        return [self._row_to_player(r) for r in rows]
+        return await self._cached_leaderboard(
+            self._kill_cache, limit, self._db.get_kill_leaderboard, KillRankEntry
+        )
+
+    async def _cached_leaderboard(
+        self,
+        cache: dict[int, list[_RankEntryT]],
+        limit: int,
+        query: Callable[[int], list[sqlite3.Row]],
+        entry_type: type[_RankEntryT],
+    ) -> list[_RankEntryT]:
+        """排行榜查詢結果在同一份存檔內沿用，不重複查詢 SQLite。
+
+        row 依 SELECT 欄位順序直接對應 entry_type 的必填欄位，欄位數不符時會拋出 TypeError。
+        """
+        cached = cache.get(limit)
+        if cached is None:
+            generation = self._import_generation
+            rows = await asyncio.to_thread(query, limit)
+            cached = [entry_type(*row) for row in rows]
+            # 查詢期間若已完成新的匯入，結果可能是舊資料，不寫入快取
+            if generation == self._import_generation:
+                cache[limit] = cached
+        return list(cached)
 
     async def get_game_state(self) -> SaveGameState | None:
         """查詢遊戲狀態。"""
@@ -425,39 +611,22 @@ class SaveService:
         """取得最近一次解析的 meta 資訊。"""
         return await asyncio.to_thread(self._db.get_save_meta)
 
+    def _rows_to_players(self, rows: list[sqlite3.Row]) -> list[SavePlayerData]:
+        """將同一查詢的 sqlite3.Row 轉為 SavePlayerData（欄位對應表只建立一次）。"""
+        if not rows:
+            return []
+        plan = _player_column_plan(tuple(rows[0].keys()))
+        return [self._row_to_player(r, plan) for r in rows]
+
     @staticmethod
-    def _row_to_player(row: dict) -> SavePlayerData:
-        """將 SQLite row dict 轉為 SavePlayerData。"""
-        # 解析 challenges_json
-        challenges_str = row.get("challenges_json", "{}")
-        try:
-            challenges = json.loads(challenges_str) if challenges_str else {}
-        except (json.JSONDecodeError, TypeError):
-            challenges = {}
-
-        return SavePlayerData(
-            steam_id=row.get("steam_id", ""),
-            x=row.get("x", 0.0),
-            y=row.get("y", 0.0),
-            z=row.get("z", 0.0),
-            health=row.get("health", 0.0),
-            hunger=row.get("hunger", 0.0),
-            thirst=row.get("thirst", 0.0),
-            stamina=row.get("stamina", 0.0),
-            infection=row.get("infection", 0.0),
-            bites=row.get("bites", 0),
-            survival_days=row.get("survival_days", 0),
-            profession=row.get("profession", ""),
-            is_male=bool(row.get("is_male", 1)),
-            zombies_killed=row.get("zombies_killed", 0),
-            headshots=row.get("headshots", 0),
-            melee_kills=row.get("melee_kills", 0),
-            gun_kills=row.get("gun_kills", 0),
-            blast_kills=row.get("blast_kills", 0),
-            fist_kills=row.get("fist_kills", 0),
-            vehicle_kills=row.get("vehicle_kills", 0),
-            takedown_kills=row.get("takedown_kills", 0),
-            fish_caught=row.get("fish_caught", 0),
-            times_bitten=row.get("times_bitten", 0),
-            challenges=challenges,
-        )
+    def _row_to_player(
+        row: sqlite3.Row, plan: tuple[tuple[int, str], ...]
+    ) -> SavePlayerData:
+        """將 SQLite row 依欄位對應表轉為 SavePlayerData。
+
+        challenges_json 原樣保留，由 SavePlayerData.challenges 延遲解析。
+        """
+        values = {k: row[i] for i, k in plan}
+        if "is_male" in values:
+            values["is_male"] = bool(values["is_male"])
+        return SavePlayerData(**values)
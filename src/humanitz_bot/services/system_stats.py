@@ -14,11 +14,23 @@ logger = logging.getLogger("humanitz_bot.services.system_stats")
 
 _BYTES_PER_GB = 1024**3
 
+# 開機時間與根目錄在程序生命週期內不變，只計算一次
+_BOOT_TIME = psutil.boot_time()
+_ROOT = os.path.abspath(os.sep)
+
+# 預熱 CPU 取樣基準：之後 cpu_percent(interval=None) 立即回傳自上次呼叫以來的平均使用率
+psutil.cpu_percent(interval=None)
+
+# 硬碟用量變化緩慢，快取 60 秒（狀態更新間隔最短 10 秒）
+_DISK_CACHE_TTL = 60.0
+# (monotonic 時間, (used GB, total GB, percent))
+_disk_cache: tuple[float, tuple[float, float, float]] | None = None
+
 _last_net: dict[str, float] = {}
 _net_lock = threading.Lock()
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemStats:
     cpu_percent: float
     memory_used: float
@@ -32,20 +44,31 @@ class SystemStats:
     uptime_seconds: float
 
 
+def _get_disk_usage() -> tuple[float, float, float]:
+    """取得根目錄硬碟用量 (used GB, total GB, percent)，_DISK_CACHE_TTL 秒內沿用上次結果。"""
+    global _disk_cache
+    now = time.monotonic()
+    if _disk_cache is not None and now - _disk_cache[0] < _DISK_CACHE_TTL:
+        return _disk_cache[1]
+    disk = psutil.disk_usage(_ROOT)
+    usage = (disk.used / _BYTES_PER_GB, disk.total / _BYTES_PER_GB, disk.percent)
+    _disk_cache = (now, usage)
+    return usage
+
+
 def get_system_stats() -> SystemStats:
     """取得當前系統資源狀態。
 
-    網路速度透過兩次呼叫間的 delta 計算，首次呼叫回傳 0.0。
+    CPU 使用率與網路速度皆透過兩次呼叫間的 delta 計算（不阻塞取樣），
+    網路速度首次呼叫回傳 0.0。
     """
-    cpu = psutil.cpu_percent(interval=0.5)
+    cpu = psutil.cpu_percent(interval=None)
 
     mem = psutil.virtual_memory()
     memory_used = mem.used / _BYTES_PER_GB
     memory_total = mem.total / _BYTES_PER_GB
 
-    disk = psutil.disk_usage(os.path.abspath(os.sep))
-    disk_used = disk.used / _BYTES_PER_GB
-    disk_total = disk.total / _BYTES_PER_GB
+    disk_used, disk_total, disk_percent = _get_disk_usage()
 
     net = psutil.net_io_counters()
     now = time.monotonic()
@@ -63,7 +86,7 @@ def get_system_stats() -> SystemStats:
         _last_net["sent"] = net.bytes_sent
         _last_net["recv"] = net.bytes_recv
 
-    uptime = time.time() - psutil.boot_time()
+    uptime = time.time() - _BOOT_TIME
 
     return SystemStats(
         cpu_percent=cpu,
@@ -72,7 +95,7 @@ def get_system_stats() -> SystemStats:
         memory_percent=mem.percent,
         disk_used=round(disk_used, 2),
         disk_total=round(disk_total, 2),
-        disk_percent=disk.percent,
+        disk_percent=disk_percent,
         net_sent_per_sec=round(sent_per_sec, 2),
         net_recv_per_sec=round(recv_per_sec, 2),
         uptime_seconds=round(uptime, 2),
@@ -3,6 +3,7 @@ from __future__ import annotations
 import enum
 import logging
 import re
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from dataclasses import dataclass
@@ -21,9 +22,9 @@ class ChatEventType(enum.Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChatEvent:
-    """聊天事件資料結構"""
+    """聊天事件資料結構（不可變）"""
 
     event_type: ChatEventType
     player_name: str  # 玩家名稱 (admin/unknown 時為空)
@@ -31,31 +32,65 @@ class ChatEvent:
     raw_line: str  # 原始未解析行
 
 
-# RCON 時間戳前綴: [1/3/2,026 - 14:7] — 遊戲更新 2026-03-01 起新增
+# RCON 時間戳: [1/3/2,026 - 14:7] — 遊戲更新 2026-03-01 起新增
 # 年份千位分隔符因系統語系不同可能是逗號(2,026)或空格(2 026)
-_RCON_TIMESTAMP_RE = re.compile(r"^\[\d+/\d+/[\d, ]+ - \d+:\d+\]\s*")
-
-# 檔案時間戳前綴: (3/3/2,026 0:12) — HZLogs/Chat/ 檔案格式
-_FILE_TIMESTAMP_RE = re.compile(r"^\(\d+/\d+/[\d, ]+ \d+:\d+\)\s*")
-
-# 內嵌時間戳: 用於分割黏合的多事件行（如 Event1</>)[ts2] Event2）
-# 內嵌時間戳: 用於分割黏合的多事件行（RCON 和檔案格式皆支援）
-_EMBEDDED_TS_RE = re.compile(
-    r"(?<=\))(?="
-    r"(?:\[\d+/\d+/[\d, ]+ - \d+:\d+\]"
-    r"|\(\d+/\d+/[\d, ]+ \d+:\d+\))"
-    r")"
+_RCON_TS = r"\[\d+/\d+/[\d, ]+ - \d+:\d+\]"
+
+# 檔案時間戳: (3/3/2,026 0:12) — HZLogs/Chat/ 檔案格式
+_FILE_TS = r"\(\d+/\d+/[\d, ]+ \d+:\d+\)"
+
+# 行首時間戳前綴
+_RCON_TIMESTAMP_RE = re.compile(rf"^{_RCON_TS}\s*")
+_FILE_TIMESTAMP_RE = re.compile(rf"^{_FILE_TS}\s*")
+
+# 內嵌時間戳: 用於分割黏合的多事件行（如 Event1</>)[ts2] Event2，RCON 和檔案格式皆支援）
+_EMBEDDED_TS_RE = re.compile(rf"(?<=\))(?=(?:{_RCON_TS}|{_FILE_TS}))")
+
+# 事件 pattern（匹配去除時間戳後的內容）
+# 所有事件格式合併為單一 alternation，一次 match 即可判定類型；
+# 分支順序即優先順序（管理員玩家聊天必須在普通玩家聊天之前）
+# 玩家名稱使用 [^<\n] 而非 .*? 以避免跨事件回溯配對的問題（也不跨行，供批次解析共用）
+_EVENT_ALTERNATION = (
+    # 管理員玩家聊天: <SP>[Admin]</><PN>PlayerName:</>訊息
+    r"<SP>\[Admin\]</><PN>(?P<admin_chat_name>[^<\n]+):</>(?P<admin_chat_msg>.+)"
+    # 普通玩家聊天: <PN>PlayerName:</>訊息
+    r"|<PN>(?P<chat_name>[^<\n]+):</>(?P<chat_msg>.+)"
+    r"|Player Joined \(<PN>(?P<joined>[^<\n]*)</>\)"
+    r"|Player Left \(<PN>(?P<left>[^<\n]*)</>\)"
+    r"|Player died \(<PN>(?P<died>[^<\n]*)</>\)"
+    # 管理員訊息: <SP>Admin: 訊息</>
+    r"|<SP>Admin: (?P<admin>.+)</>"
+)
+_EVENT_RE = re.compile(rf"^(?:{_EVENT_ALTERNATION})$")
+
+# 批次解析：多行以 \n 串接後一次 finditer，每行恰好產生一個 match。
+# 時間戳前綴（順序同 _strip_timestamp）與事件在同一個 pattern 中匹配，
+# 不符合任何事件的行由結尾的 .* 吃掉（lastgroup 為 None → UNKNOWN）
+_BATCH_EVENT_RE = re.compile(
+    rf"^(?:{_RCON_TS}[^\S\n]*)?(?:{_FILE_TS}[^\S\n]*)?"
+    rf"(?:(?:{_EVENT_ALTERNATION})$)?.*$",
+    re.MULTILINE,
 )
 
-# 編譯正則表達式 patterns（匹配去除時間戳後的內容）
-# 玩家名稱使用 [^<]* 而非 .*? 以避免跨事件回溯配對的問題
-_CHAT_RE = re.compile(r"^<PN>([^<]+):</>(.+)$")
-# 管理員玩家聊天: <SP>[Admin]</><PN>PlayerName:</>訊息
-_ADMIN_CHAT_RE = re.compile(r"^<SP>\[Admin\]</><PN>([^<]+):</>(.+)$")
-_JOIN_RE = re.compile(r"^Player Joined \(<PN>([^<]*)</>\)$")
-_LEFT_RE = re.compile(r"^Player Left \(<PN>([^<]*)</>\)$")
-_DIED_RE = re.compile(r"^Player died \(<PN>([^<]*)</>\)$")
-_ADMIN_RE = re.compile(r"^<SP>Admin: (.+)</>$")
+# _EVENT_RE 的 lastgroup → (事件類型, 玩家名稱 group, 訊息 group)
+_EVENT_GROUPS: dict[str, tuple[ChatEventType, str | None, str | None]] = {
+    "admin_chat_msg": (
+        ChatEventType.PLAYER_CHAT,
+        "admin_chat_name",
+        "admin_chat_msg",
+    ),
+    "chat_msg": (ChatEventType.PLAYER_CHAT, "chat_name", "chat_msg"),
+    "joined": (ChatEventType.PLAYER_JOINED, "joined", None),
+    "left": (ChatEventType.PLAYER_LEFT, "left", None),
+    "died": (ChatEventType.PLAYER_DIED, "died", None),
+    "admin": (ChatEventType.ADMIN_MESSAGE, None, "admin"),
+}
+
+# 熱路徑（ChatDiffer / ChatLogTailer）直接呼叫預先綁定的 C 方法，省去每次的屬性查找
+_split_embedded = _EMBEDDED_TS_RE.split
+_iter_batch_events = _BATCH_EVENT_RE.finditer
+# 玩家名稱在大量事件中重複出現，intern 後同一玩家的事件共用同一個字串物件
+_intern = sys.intern
 
 
 def _split_events(line: str) -> list[str]:
@@ -65,7 +100,7 @@ def _split_events(line: str) -> list[str]:
     [ts1] Event1</>)[ts2] Event2</>)
     用內嵌時間戳分割為獨立行。
     """
-    parts = _EMBEDDED_TS_RE.split(line)
+    parts = _split_embedded(line)
     return [p.strip() for p in parts if p.strip()]
 
 
@@ -89,10 +124,27 @@ def _strip_timestamp(line: str) -> str:
     return _FILE_TIMESTAMP_RE.sub("", result)
 
 
+def _event_from_match(m: re.Match[str] | None, line: str) -> ChatEvent:
+    """依事件 regex 的 match 結果（lastgroup 判定類型）建立 ChatEvent。"""
+    group = m.lastgroup if m is not None else None
+    if group is None:
+        # 未知格式
+        return ChatEvent(ChatEventType.UNKNOWN, "", "", line)
+
+    event_type, name_group, msg_group = _EVENT_GROUPS[group]
+    return ChatEvent(
+        event_type=event_type,
+        player_name=_intern(m[name_group]) if name_group else "",
+        message=m[msg_group] if msg_group else "",
+        raw_line=line,
+    )
+
+
 def parse_chat_line(line: str) -> ChatEvent:
     """解析單行 fetchchat 輸出
 
     支援帶時間戳前綴（2026-03-01+ 新格式）與無時間戳（舊格式）的行。
+    ChatDiffer / ChatLogTailer 走批次的 _parse_lines，此函式供單行解析使用。
 
     Args:
         line: fetchchat 輸出的單行文字
@@ -108,75 +160,19 @@ def parse_chat_line(line: str) -> ChatEvent:
         ChatEvent(event_type=ChatEventType.PLAYER_JOINED, player_name='OG83', ...)
     """
     # 先移除時間戳前綴，再進行 pattern 匹配
-    stripped = _strip_timestamp(line)
-
-    # 管理員玩家聊天: <SP>[Admin]</><PN>PlayerName:</>MessageText
-    # 必須在普通玩家聊天之前檢查，因為普通 regex 無法匹配此格式
-    m = _ADMIN_CHAT_RE.match(stripped)
-    if m:
-        return ChatEvent(
-            event_type=ChatEventType.PLAYER_CHAT,
-            player_name=m.group(1),
-            message=m.group(2),
-            raw_line=line,
-        )
-
-    # 普通玩家聊天: <PN>PlayerName:</>MessageText
-    m = _CHAT_RE.match(stripped)
-    if m:
-        return ChatEvent(
-            event_type=ChatEventType.PLAYER_CHAT,
-            player_name=m.group(1),
-            message=m.group(2),
-            raw_line=line,
-        )
-    # 玩家加入: Player Joined (<PN>PlayerName</>)
-    m = _JOIN_RE.match(stripped)
-    if m:
-        return ChatEvent(
-            event_type=ChatEventType.PLAYER_JOINED,
-            player_name=m.group(1),
-            message="",
-            raw_line=line,
-        )
-
-    # 玩家離開: Player Left (<PN>PlayerName</>)
-    m = _LEFT_RE.match(stripped)
-    if m:
-        return ChatEvent(
-            event_type=ChatEventType.PLAYER_LEFT,
-            player_name=m.group(1),
-            message="",
-            raw_line=line,
-        )
+    return _event_from_match(_EVENT_RE.match(_strip_timestamp(line)), line)
 
-    # 玩家死亡: Player died (<PN>PlayerName</>)
-    m = _DIED_RE.match(stripped)
-    if m:
-        return ChatEvent(
-            event_type=ChatEventType.PLAYER_DIED,
-            player_name=m.group(1),
-            message="",
-            raw_line=line,
-        )
 
-    # 管理員訊息: <SP>Admin: MessageText</>
-    m = _ADMIN_RE.match(stripped)
-    if m:
-        return ChatEvent(
-            event_type=ChatEventType.ADMIN_MESSAGE,
-            player_name="",
-            message=m.group(1),
-            raw_line=line,
-        )
+def _parse_lines(lines: list[str]) -> list[ChatEvent]:
+    """批次解析多行（結果與逐行 parse_chat_line 相同）。
 
-    # 未知格式
-    return ChatEvent(
-        event_type=ChatEventType.UNKNOWN,
-        player_name="",
-        message="",
-        raw_line=line,
-    )
+    行內不可含 \n（呼叫端皆已分行）。
+    以單次 finditer 處理整批行，省去每行進出 regex 引擎的成本。
+    """
+    return [
+        _event_from_match(m, line)
+        for line, m in zip(lines, _iter_batch_events("\n".join(lines)))
+    ]
 
 
 class ChatDiffer:
@@ -190,26 +186,26 @@ class ChatDiffer:
     def _diff(old: list[str], new: list[str]) -> list[str]:
         """找出新快照相較於舊快照的新增行。
 
-        在新快照中從尾端搜尋舊快照最後一行的位置，
-        並透過比對前面連續行來驗證錨點，正確處理重複內容。
+        緩衝區尚未滿時 fetchchat 只會在尾端追加，舊快照即為新快照的前綴，
+        直接返回多出的部分；否則（舊行已被捲出）在新快照中從尾端搜尋
+        舊快照最後一行的位置，並透過比對前面連續行來驗證錨點，正確處理重複內容。
+        驗證以 list 切片整段比較（C 層逐一比對），不在 Python 迴圈中逐行比較。
         """
         if not old or not new:
             return new
 
         last_old = old[-1]
+        n = len(old)
+        # 快速路徑：只追加（先比對錨點行，不符時不做整段比較）
+        if len(new) >= n and new[n - 1] == last_old and new[:n] == old:
+            return new[n:]
+
         for j in range(len(new) - 1, -1, -1):
             if new[j] != last_old:
                 continue
-            # Verify preceding lines match to avoid false anchor on duplicates
-            verified = True
-            for k in range(1, len(old)):
-                new_idx = j - k
-                if new_idx < 0:
-                    break
-                if old[len(old) - 1 - k] != new[new_idx]:
-                    verified = False
-                    break
-            if verified:
+            # 新快照開頭之前的舊行可能已被捲出緩衝區，只比對重疊部分
+            k = min(n, j + 1)
+            if new[j + 1 - k : j + 1] == old[n - k :]:
                 return new[j + 1 :]
 
         logger.debug("No overlap found, treating all %d lines as new", len(new))
@@ -227,10 +223,11 @@ class ChatDiffer:
         Returns:
             list[ChatEvent]: 新事件列表
         """
-        # 正規化換行符號並分割行
+        # 正規化換行符號並分割行（只以 \r\n / \r / \n 分行；
+        # 不用 splitlines，避免玩家訊息中的 U+2028、\x85 等字元把訊息切斷），每行只 strip 一次
         normalized = raw_chat.replace("\r\n", "\n").replace("\r", "\n")
         current_lines = [
-            line.strip() for line in normalized.split("\n") if line.strip()
+            s for s in (line.strip() for line in normalized.split("\n")) if s
         ]
 
         # 第一次呼叫：初始化快照，返回空列表
@@ -251,10 +248,9 @@ class ChatDiffer:
         self._last_lines = current_lines
 
         # 解析新行（先分割可能黏合的多事件行）
-        new_events: list[ChatEvent] = []
-        for line in new_lines:
-            for sub_line in _split_events(line):
-                new_events.append(parse_chat_line(sub_line))
+        new_events = _parse_lines(
+            [sub_line for line in new_lines for sub_line in _split_events(line)]
+        )
         logger.debug("Parsed %d new events", len(new_events))
 
         return new_events
@@ -362,13 +358,14 @@ class ChatLogTailer:
             logger.error("Failed to read chat log %s: %s", file_path, e)
             return []
 
-        events: list[ChatEvent] = []
-        for line in new_content.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            for sub_line in _split_events(line):
-                events.append(parse_chat_line(sub_line))
+        events = _parse_lines(
+            [
+                sub_line
+                for raw in new_content.splitlines()
+                if (line := raw.strip())
+                for sub_line in _split_events(line)
+            ]
+        )
 
         if events:
             logger.debug(
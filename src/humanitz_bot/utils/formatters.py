@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-import logging
 from datetime import timedelta
+from functools import lru_cache
 
-logger = logging.getLogger("humanitz_bot.utils.formatters")
+
+@lru_cache(maxsize=8)
+def _progress_bars(length: int) -> tuple[str, ...]:
+    """指定長度下所有可能的進度條（索引 = 填滿格數）。"""
+    return tuple("▰" * i + "▱" * (length - i) for i in range(length + 1))
 
 
 def make_progress_bar(percent: float, length: int = 10) -> str:
@@ -15,9 +19,41 @@ def make_progress_bar(percent: float, length: int = 10) -> str:
         >>> make_progress_bar(63.8)
         '▰▰▰▰▰▰▱▱▱▱'
     """
-    filled = round(percent / 100 * length)
-    filled = max(0, min(filled, length))
-    return "▰" * filled + "▱" * (length - filled)
+    # 縮放整數四捨五入（.5 一律進位），不經 round() 的銀行家捨入
+    filled = int(percent * length + 50) // 100
+    if filled < 0:
+        filled = 0
+    elif filled > length:
+        filled = length
+    return _progress_bars(length)[filled]
+
+
+_DAY_MINUTES = 1440
+
+
+def _hours_minutes(total_minutes: int) -> str:
+    hours, minutes = divmod(total_minutes, 60)
+    if hours > 0:
+        return f"{hours}h{minutes}m"
+    return f"{minutes}m"
+
+
+# 一天內（0–1439 分鐘）的 "1h18m" / "38m" 字串預先建表，常見情況直接以索引取得
+_HOURS_MINUTES: tuple[str, ...] = tuple(_hours_minutes(m) for m in range(_DAY_MINUTES))
+
+
+def format_hours_minutes(total_minutes: int) -> str:
+    """將總分鐘數格式化為 "1h18m" / "38m"（不進位到天，負數視為 0）。
+
+    Examples:
+        >>> format_hours_minutes(78)
+        '1h18m'
+        >>> format_hours_minutes(1501)
+        '25h1m'
+    """
+    if total_minutes < _DAY_MINUTES:
+        return _HOURS_MINUTES[max(0, total_minutes)]
+    return _hours_minutes(total_minutes)
 
 
 def format_duration(td: timedelta) -> str:
@@ -33,21 +69,19 @@ def format_duration(td: timedelta) -> str:
         >>> format_duration(timedelta(seconds=30))
         '<1m'
     """
-    total_seconds = int(td.total_seconds())
-    if total_seconds < 0:
-        total_seconds = 0
+    total_minutes = int(td.total_seconds()) // 60
+    if total_minutes <= 0:
+        return "<1m"
+    if total_minutes < _DAY_MINUTES:
+        return _HOURS_MINUTES[total_minutes]
+    days, remainder = divmod(total_minutes, _DAY_MINUTES)
+    hours, minutes = divmod(remainder, 60)
+    return f"{days}d{hours}h{minutes}m"
 
-    days, remainder = divmod(total_seconds, 86400)
-    hours, remainder = divmod(remainder, 3600)
-    minutes = remainder // 60
 
-    if days > 0:
-        return f"{days}d{hours}h{minutes}m"
-    if hours > 0:
-        return f"{hours}h{minutes}m"
-    if minutes > 0:
-        return f"{minutes}m"
-    return "<1m"
+# format_bytes 單位門檻（float 常數，除法時不必先將 int 轉為 float）
+_KB = 1024.0
+_MB = 1024.0 * 1024.0
 
 
 def format_bytes(n: float) -> str:
@@ -61,12 +95,11 @@ def format_bytes(n: float) -> str:
         >>> format_bytes(256)
         '256 B/s'
     """
-    if n < 1024:
+    if n < _KB:
         return f"{n:.0f} B/s"
-    elif n < 1024 * 1024:
-        return f"{n / 1024:.1f} KB/s"
-    else:
-        return f"{n / (1024 * 1024):.1f} MB/s"
+    if n < _MB:
+        return f"{n / _KB:.1f} KB/s"
+    return f"{n / _MB:.1f} MB/s"
 
 
 SEASON_EMOJI: dict[str, str] = {
@@ -89,11 +122,16 @@ WEATHER_EMOJI: dict[str, str] = {
 }
 
 
+# 預先綁定 dict.get，每次查詢省去全域與屬性查找
+_get_season = SEASON_EMOJI.get
+_get_weather = WEATHER_EMOJI.get
+
+
 def get_season_emoji(season: str) -> str:
     """取得季節對應的 emoji。"""
-    return SEASON_EMOJI.get(season, "🗓️")
+    return _get_season(season, "🗓️")
 
 
 def get_weather_emoji(weather: str) -> str:
     """取得天氣對應的 emoji。"""
-    return WEATHER_EMOJI.get(weather, "🌤️")
+    return _get_weather(weather, "🌤️")
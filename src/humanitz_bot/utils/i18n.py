@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from string import Formatter
 from typing import Any
 
 _STRINGS: dict[str, dict[str, str]] = {
@@ -359,19 +360,63 @@ _STRINGS: dict[str, dict[str, str]] = {
     },
 }
 
+# 各語系預先合併英文後備（缺漏或空字串皆以英文取代），查詢只需一次 dict 探測
+_RESOLVED: dict[str, dict[str, str]] = {
+    locale: {**_STRINGS["en"], **{k: v for k, v in table.items() if v}}
+    for locale, table in _STRINGS.items()
+}
+
+
+def _split_single_field(text: str) -> tuple[str, str, str] | None:
+    """只含單一簡單欄位（如 {name}）的模板拆為 (前綴, 欄位名, 後綴)，否則回傳 None。"""
+    try:
+        parts = list(Formatter().parse(text))
+    except ValueError:
+        return None
+    fields = [p for p in parts if p[1] is not None]
+    if len(fields) != 1:
+        return None
+    _, field, spec, conversion = fields[0]
+    if not field.isidentifier() or spec or conversion:
+        return None
+    # 字面大括號（{{ }}）需經 format 還原，不走快速路徑
+    if "{{" in text or "}}" in text:
+        return None
+    prefix, _, suffix = text.partition("{" + field + "}")
+    return prefix, field, suffix
+
+
+# 單一欄位模板（如 chat.joined 的 {name}）預先拆開，呼叫時直接串接，不經 str.format 解析
+_SPLITS: dict[str, dict[str, tuple[str, str, str]]] = {
+    locale: {
+        key: split
+        for key, text in table.items()
+        if (split := _split_single_field(text)) is not None
+    }
+    for locale, table in _RESOLVED.items()
+}
+
 _current_locale: str = "en"
+_current_table: dict[str, str] = _RESOLVED["en"]
+_current_splits: dict[str, tuple[str, str, str]] = _SPLITS["en"]
 
 
 def set_locale(locale: str) -> None:
-    global _current_locale
+    global _current_locale, _current_table, _current_splits
     if locale not in _STRINGS:
         raise ValueError(f"Unsupported locale: {locale}. Available: {list(_STRINGS)}")
     _current_locale = locale
+    _current_table = _RESOLVED[locale]
+    _current_splits = _SPLITS[locale]
 
 
 def t(key: str, **kwargs: Any) -> str:
-    table = _STRINGS.get(_current_locale, _STRINGS["en"])
-    text = table.get(key) or _STRINGS["en"].get(key, key)
-    if kwargs:
-        return text.format(**kwargs)
-    return text
+    # 大多數呼叫不帶參數，最先處理
+    if not kwargs:
+        return _current_table.get(key, key)
+    if len(kwargs) == 1:
+        split = _current_splits.get(key)
+        if split is not None and split[1] in kwargs:
+            prefix, field, suffix = split
+            return f"{prefix}{kwargs[field]}{suffix}"
+    return _current_table.get(key, key).format(**kwargs)